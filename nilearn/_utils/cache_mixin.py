@@ -7,8 +7,10 @@ from pathlib import Path
 from joblib import Memory
 
 import nilearn
+from nilearn._utils.cache_statistics import _RecordedFunc, is_recording
 from nilearn._utils.helpers import stringify_path
 from nilearn._utils.logger import find_stack_level
+from nilearn._utils.tiered_memory import TieredMemory, _to_bytes
 
 MEMORY_CLASSES = (Memory,)
 
@@ -73,6 +75,13 @@ def check_memory(memory, verbose=0):
     return memory
 
 
+def _caches_in_memory(memory):
+    """Return True if results are cached in memory, even without location."""
+    return isinstance(memory, TieredMemory) and bool(
+        _to_bytes(memory.max_memory_bytes)
+    )
+
+
 class _ShelvedFunc:
     """Work around for Python 2, for which pickle fails on instance method."""
 
@@ -160,6 +169,7 @@ def cache(
             )
         if (
             memory.location is None
+            and not _caches_in_memory(memory)
             and memory_level is not None
             and memory_level > 1
         ):
@@ -173,6 +183,10 @@ def cache(
     else:
         memory = Memory(location=None, verbose=verbose)
     cached_func = memory.cache(func, **kwargs)
+    if is_recording():
+        cached_func = _RecordedFunc(
+            cached_func, func, memory_level, func_memory_level
+        )
     if shelve:
         cached_func = _ShelvedFunc(cached_func)
     return cached_func
@@ -232,7 +246,10 @@ class CacheMixin:
             self._fit_cache()
         # If cache level is 0 but a memory object has been provided, set
         # memory_level to 1 with a warning.
-        if self.memory_level == 0 and self.memory_.location is not None:
+        if self.memory_level == 0 and (
+            self.memory_.location is not None
+            or _caches_in_memory(self.memory_)
+        ):
             warnings.warn(
                 "memory_level is currently set to 0 but "
                 "a Memory object has been provided. "
@@ -0,0 +1,204 @@
+"""Record statistics of the calls to cached functions."""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+from joblib.memory import NotMemorizedFunc
+
+from nilearn._utils.tiered_memory import _nbytes
+
+_ACTIVE_RECORDERS = []
+_ACTIVE_RECORDERS_LOCK = threading.Lock()
+
+_COUNTERS = (
+    "n_calls",
+    "n_hits",
+    "n_misses",
+    "n_uncached",
+    "hash_time",
+    "load_time",
+    "compute_time",
+    "bytes_stored",
+)
+
+
+class CacheStatistics:
+    """Record hits, misses and timings of the calls to cached functions.
+
+    While this context manager is active, every call to a function
+    cached by nilearn estimators or functions in the current process
+    is recorded, whether caching is enabled for it or not.
+
+    .. nilearn_versionadded:: 0.14.1
+
+    Attributes
+    ----------
+    stats_ : :obj:`dict`
+        Statistics of each function, indexed by its qualified name.
+        For each function:
+
+        - ``n_calls``: number of calls,
+        - ``n_hits``: number of results loaded from the cache,
+        - ``n_misses``: number of results computed and stored in the cache,
+        - ``n_uncached``: number of calls for which caching was disabled,
+          for example because of its ``memory_level``,
+        - ``hash_time``: time spent hashing arguments
+          to look up results, in seconds,
+        - ``load_time``: time spent loading results from the cache,
+        - ``compute_time``: time spent computing results,
+          including storing them in the cache,
+        - ``bytes_stored``: estimated size of the results
+          stored in the cache,
+        - ``memory_level``: the ``memory_level`` the function was called with,
+        - ``func_memory_level``: the level from which caching is enabled
+          for the function.
+
+    Notes
+    -----
+    Calls run in other processes, for example by joblib workers
+    with ``n_jobs > 1``, are not recorded.
+
+    Examples
+    --------
+    >>> from nilearn.utils import CacheStatistics
+    >>> with CacheStatistics() as stats:  # doctest: +SKIP
+    ...     masker.fit_transform(imgs)
+    >>> stats.to_dataframe()  # doctest: +SKIP
+    """
+
+    def __init__(self):
+        self.stats_ = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with _ACTIVE_RECORDERS_LOCK:
+            _ACTIVE_RECORDERS.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        with _ACTIVE_RECORDERS_LOCK:
+            _ACTIVE_RECORDERS.remove(self)
+
+    def _record(self, name, memory_level, func_memory_level, **counts):
+        with self._lock:
+            stats = self.stats_.setdefault(name, dict.fromkeys(_COUNTERS, 0))
+            for counter, value in counts.items():
+                stats[counter] += value
+            stats["memory_level"] = memory_level
+            stats["func_memory_level"] = func_memory_level
+
+    def to_dataframe(self):
+        """Return the statistics as a DataFrame.
+
+        Returns
+        -------
+        stats : :obj:`pandas.DataFrame`
+            One row per function, with the statistics described in
+            ``stats_``, as well as ``mean_hash_time`` per call,
+            ``mean_load_time`` per hit and ``mean_compute_time``
+            per call that was not loaded from the cache.
+            Functions where ``mean_hash_time`` is close to
+            ``mean_compute_time`` do not benefit from caching.
+        """
+        columns = [*_COUNTERS, "memory_level", "func_memory_level"]
+        with self._lock:
+            stats = pd.DataFrame.from_dict(
+                self.stats_, orient="index", columns=columns
+            )
+        stats.index.name = "function"
+        n_computed = stats["n_misses"] + stats["n_uncached"]
+        stats["mean_hash_time"] = stats["hash_time"] / stats["n_calls"]
+        stats["mean_load_time"] = stats["load_time"] / stats["n_hits"]
+        stats["mean_compute_time"] = stats["compute_time"] / n_computed
+        return stats.sort_index()
+
+    def to_json(self, filename=None):
+        """Export the statistics to JSON.
+
+        Parameters
+        ----------
+        filename : :obj:`str`, :class:`pathlib.Path` or None, default=None
+            File to write the statistics to.
+
+        Returns
+        -------
+        stats : :obj:`str`
+            The statistics in ``stats_`` as a JSON string.
+        """
+        with self._lock:
+            stats = json.dumps(self.stats_, indent=4, sort_keys=True)
+        if filename is not None:
+            Path(filename).write_text(stats)
+        return stats
+
+
+def is_recording():
+    """Return True if statistics of cached calls are being recorded."""
+    return bool(_ACTIVE_RECORDERS)
+
+
+def _func_name(func):
+    name = getattr(func, "__qualname__", type(func).__qualname__)
+    module = getattr(func, "__module__", type(func).__module__)
+    return f"{module}.{name}"
+
+
+class _RecordedFunc:
+    """Record the statistics of the calls to a cached function."""
+
+    def __init__(self, cached_func, func, memory_level, func_memory_level):
+        self.cached_func = cached_func
+        self.name = _func_name(func)
+        self.__name__ = getattr(func, "__name__", type(func).__name__)
+        self.memory_level = memory_level
+        self.func_memory_level = func_memory_level
+
+    def _record(self, **counts):
+        for recorder in _ACTIVE_RECORDERS:
+            recorder._record(
+                self.name, self.memory_level, self.func_memory_level, **counts
+            )
+
+    def _call(self, method, args, kwargs, shelve=False):
+        if isinstance(self.cached_func, NotMemorizedFunc):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            self._record(
+                n_calls=1,
+                n_uncached=1,
+                compute_time=time.perf_counter() - start,
+            )
+            return result
+
+        start = time.perf_counter()
+        is_cached = self.cached_func.check_call_in_cache(*args, **kwargs)
+        hash_time = time.perf_counter() - start
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        # the arguments are hashed again by the call
+        call_time = max(time.perf_counter() - start - hash_time, 0.0)
+        if is_cached:
+            self._record(
+                n_calls=1, n_hits=1, hash_time=hash_time, load_time=call_time
+            )
+        else:
+            self._record(
+                n_calls=1,
+                n_misses=1,
+                hash_time=hash_time,
+                compute_time=call_time,
+                # shelved results are not loaded to measure them
+                bytes_stored=0 if shelve else _nbytes(result),
+            )
+        return result
+
+    def __call__(self, *args, **kwargs):
+        return self._call(self.cached_func, args, kwargs)
+
+    def call_and_shelve(self, *args, **kwargs):
+        return self._call(
+            self.cached_func.call_and_shelve, args, kwargs, shelve=True
+        )
@@ -159,6 +159,20 @@ cbar_tick_format : :obj:`str`, optional
     Ex: use "%%.2g" to display using scientific notation.
 """
 
+# chunk_size
+docdict["chunk_size"] = """
+chunk_size : :obj:`int` or None, default=None
+    Number of volumes to load at once when extracting signals
+    from 4D images.
+    If not None, the images are read by chunks of ``chunk_size`` volumes
+    (memory-mapped if the file is uncompressed),
+    and each chunk is smoothed and masked before the next one is loaded.
+    This bounds peak memory usage by the size of a chunk
+    plus the size of the masked signals,
+    instead of the size of the full 4D image.
+    If None, the whole image is loaded at once.
+"""
+
 # classifier_options
 svc = "Linear support vector classifier"
 logistic = "Logistic regression"
@@ -843,6 +857,8 @@ memory : None, instance of :class:`joblib.Memory`, :obj:`str`, or \
     Used to cache the masking process.
     By default, no caching is done.
     If a :obj:`str` is given, it is the path to the caching directory.
+    A :class:`~nilearn.utils.TieredMemory` can be given
+    to also keep recent results in memory.
 """
 
 # memory_level
@@ -1070,6 +1086,29 @@ docdict[
 
     """
 
+# searchlight_engine
+docdict["searchlight_engine"] = """
+engine : {"generic", "batched"}, default="generic"
+    How to compute the cross-validated score of each sphere.
+
+    - ``"generic"``: fit the estimator on each sphere
+      with :func:`sklearn.model_selection.cross_val_score`.
+      Works with any scikit-learn compatible estimator.
+    - ``"batched"``: compute the closed-form solutions
+      of the estimator for batches of spheres at once
+      with stacked-array operations.
+      Much faster, but only supports
+      :class:`~sklearn.linear_model.Ridge`,
+      :class:`~sklearn.linear_model.RidgeClassifier`
+      and :class:`~sklearn.naive_bayes.GaussianNB` instances,
+      with ``scoring`` set to None or to the default score of the estimator
+      (``"r2"`` for regression, ``"accuracy"`` for classification).
+      Scores are the same as with ``"generic"``
+      up to numerical precision.
+
+    .. nilearn_versionadded:: 0.14.1
+"""
+
 # second_level_contrast
 docdict["second_level_contrast"] = """
 second_level_contrast : :obj:`str` or :class:`numpy.ndarray` of shape\
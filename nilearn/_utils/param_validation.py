@@ -175,6 +175,7 @@ TYPE_MAPS = {
     "annotate": nilearn_typing.Annotate,
     "border_size": nilearn_typing.BorderSize,
     "bg_on_data": nilearn_typing.BgOnData,
+    "chunk_size": nilearn_typing.ChunkSize,
     "colorbar": nilearn_typing.ColorBar,
     "cluster_threshold": nilearn_typing.ClusterThreshold,
     "connected": nilearn_typing.Connected,
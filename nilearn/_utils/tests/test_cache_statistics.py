@@ -0,0 +1,96 @@
+"""Test the _utils.cache_statistics module."""
+
+import json
+
+import numpy as np
+import pytest
+from joblib import Memory
+
+from nilearn._utils.cache_mixin import cache
+from nilearn._utils.cache_statistics import _RecordedFunc, is_recording
+from nilearn.maskers import NiftiMasker
+from nilearn.utils import CacheStatistics, TieredMemory
+
+
+def f(x):
+    # A simple test function
+    return np.arange(x)
+
+
+def test_cache_statistics_not_recording(tmp_path):
+    """Test that cached functions are only wrapped while recording."""
+    mem = Memory(location=tmp_path, verbose=0)
+
+    assert not is_recording()
+    assert not isinstance(cache(f, mem), _RecordedFunc)
+
+    with CacheStatistics():
+        assert is_recording()
+        assert isinstance(cache(f, mem), _RecordedFunc)
+
+    assert not is_recording()
+
+
+@pytest.mark.parametrize("memory_class", [Memory, TieredMemory])
+def test_cache_statistics(tmp_path, memory_class):
+    """Test hits, misses and calls with caching disabled."""
+    mem = memory_class(location=tmp_path, verbose=0)
+
+    with CacheStatistics() as stats:
+        cache(f, mem)(3)
+        cache(f, mem)(3)
+        cache(f, mem)(4)
+        cache(f, mem, func_memory_level=2, memory_level=1)(5)
+
+    cache(f, mem)(6)
+
+    stats = stats.stats_[f"{__name__}.f"]
+    assert stats["n_calls"] == 4
+    assert stats["n_hits"] == 1
+    assert stats["n_misses"] == 2
+    assert stats["n_uncached"] == 1
+    assert stats["bytes_stored"] == np.arange(3).nbytes + np.arange(4).nbytes
+    assert stats["memory_level"] == 1
+    assert stats["func_memory_level"] == 2
+    for timing in ["hash_time", "load_time", "compute_time"]:
+        assert stats[timing] >= 0
+
+
+def test_cache_statistics_shelving(tmp_path):
+    """Test that shelved calls are recorded."""
+    mem = Memory(location=tmp_path, verbose=0)
+
+    with CacheStatistics() as stats:
+        assert cache(f, mem, shelve=True)(3).get().tolist() == [0, 1, 2]
+        cache(f, mem, shelve=True)(3)
+
+    assert stats.stats_[f"{__name__}.f"]["n_hits"] == 1
+    assert stats.stats_[f"{__name__}.f"]["n_misses"] == 1
+
+
+def test_cache_statistics_export(tmp_path, img_3d_rand_eye):
+    """Test the export of the statistics of a masker."""
+    masker = NiftiMasker(memory=tmp_path, memory_level=1, standardize=None)
+
+    with CacheStatistics() as stats:
+        masker.fit_transform(img_3d_rand_eye)
+        masker.transform(img_3d_rand_eye)
+
+    df = stats.to_dataframe()
+
+    assert df.index.name == "function"
+    assert "nilearn.maskers.nifti_masker.filter_and_mask" in df.index
+    assert (
+        df.loc["nilearn.maskers.nifti_masker.filter_and_mask", "n_hits"] == 1
+    )
+    assert np.all(
+        df["n_calls"] == df[["n_hits", "n_misses", "n_uncached"]].sum(axis=1)
+    )
+    assert {"mean_hash_time", "mean_load_time", "mean_compute_time"} <= set(
+        df.columns
+    )
+
+    filename = tmp_path / "stats.json"
+
+    assert json.loads(stats.to_json(filename)) == stats.stats_
+    assert json.loads(filename.read_text()) == stats.stats_
@@ -0,0 +1,166 @@
+"""Test the _utils.tiered_memory module."""
+
+import os
+import pickle
+import warnings
+
+import numpy as np
+import pytest
+from nibabel import Nifti1Image, load
+from nibabel.arrayproxy import is_proxy
+
+from nilearn._utils.cache_mixin import cache
+from nilearn._utils.tiered_memory import content_key
+from nilearn.maskers import NiftiMasker
+from nilearn.utils import TieredMemory
+
+N_CALLS = {"count": 0}
+
+
+def add(x, y=1, verbose=0):  # noqa: ARG001
+    # A simple test function counting its calls
+    N_CALLS["count"] += 1
+    return np.asarray(x) + y
+
+
+@pytest.fixture
+def n_calls():
+    N_CALLS["count"] = 0
+    return N_CALLS
+
+
+@pytest.fixture
+def img_file(tmp_path, rng):
+    filename = tmp_path / "img.nii"
+    Nifti1Image(rng.random((5, 6, 7)), np.eye(4)).to_filename(filename)
+    return filename
+
+
+def test_content_key_files(img_file):
+    """Test that files are identified by name, modification time and size."""
+    key = content_key(img_file)
+
+    assert content_key(str(img_file)) == key
+    assert content_key(img_file.parent / "missing.nii") != key
+
+    stat = img_file.stat()
+    os.utime(img_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert content_key(img_file) != key
+
+
+def test_content_key_images(img_file):
+    """Test that images read from files are identified without their data."""
+    img = load(img_file)
+    key = content_key(img)
+
+    assert is_proxy(img.dataobj)
+    assert content_key(load(img_file)) == key
+    assert content_key([img, "a"]) == content_key([load(img_file), "a"])
+
+    img.header["descrip"] = b"modified"
+
+    assert content_key(img) != key
+
+    # images in memory are identified by their data
+    data = img.get_fdata()
+    in_memory = Nifti1Image(data.copy(), img.affine)
+    data[0, 0, 0] += 1
+
+    assert content_key(in_memory) != content_key(Nifti1Image(data, img.affine))
+
+
+@pytest.mark.parametrize("location", [None, "cache"])
+def test_tiered_memory_in_memory_hits(tmp_path, n_calls, location):
+    """Test that repeated calls are served from memory."""
+    if location is not None:
+        location = tmp_path / location
+    memory = TieredMemory(location=location)
+    func = memory.cache(add, ignore=["verbose"])
+
+    result = func([1, 2], y=2)
+    assert n_calls["count"] == 1
+
+    assert np.array_equal(func([1, 2], y=2, verbose=1), result)
+    assert n_calls["count"] == 1
+
+    func([1, 2], y=3)
+    assert n_calls["count"] == 2
+
+    # cached arrays are read-only
+    with pytest.raises(ValueError, match="read-only"):
+        result[0] = 0
+
+
+def test_tiered_memory_disk_hits(tmp_path, n_calls):
+    """Test that results on disk are used by a new in-memory cache."""
+    TieredMemory(location=tmp_path).cache(add)(1)
+
+    memory = pickle.loads(pickle.dumps(TieredMemory(location=tmp_path)))
+    assert len(memory._lru) == 0
+
+    assert memory.cache(add)(1) == 2
+    assert n_calls["count"] == 1
+    assert len(memory._lru) == 1
+
+
+def test_tiered_memory_max_memory_bytes(n_calls):
+    """Test that the least recently used results are evicted from memory."""
+    memory = TieredMemory(max_memory_bytes=2 * 8 * 100)
+    func = memory.cache(add)
+
+    for x in [np.zeros(100), np.ones(100), np.zeros(100), 2 * np.ones(100)]:
+        func(x)
+    assert n_calls["count"] == 3
+
+    func(np.zeros(100))
+    assert n_calls["count"] == 3
+    func(np.ones(100))
+    assert n_calls["count"] == 4
+
+    # results larger than the limit are not kept
+    func(np.zeros(1000))
+    func(np.zeros(1000))
+    assert n_calls["count"] == 6
+
+
+def test_tiered_memory_reduce_disk_size(tmp_path):
+    """Test eviction from the disk cache."""
+    memory = TieredMemory(location=tmp_path, max_disk_items=2)
+    func = memory.cache(add)
+    for x in range(4):
+        func(x)
+
+    assert len(memory.store_backend.get_items()) == 2
+
+    memory.max_disk_items = None
+    memory.max_disk_age = -1.0
+    memory.reduce_disk_size()
+
+    assert len(memory.store_backend.get_items()) == 0
+
+
+def test_tiered_memory_shelving(tmp_path, n_calls):
+    """Test shelving through the disk cache."""
+    memory = TieredMemory(location=tmp_path)
+
+    result = cache(add, memory, shelve=True)(1)
+
+    assert result.get() == 2
+    assert cache(add, memory)(1) == 2
+    assert n_calls["count"] == 1
+
+
+def test_tiered_memory_masker(img_file):
+    """Test that maskers can cache in memory only."""
+    masker = NiftiMasker(
+        memory=TieredMemory(), memory_level=2, standardize=None
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        signals = masker.fit_transform(img_file)
+
+    assert np.array_equal(masker.transform(img_file), signals)
+    assert np.array_equal(
+        NiftiMasker(standardize=None).fit_transform(img_file), signals
+    )
@@ -0,0 +1,404 @@
+"""Two-tier cache: an in-memory LRU in front of a joblib disk store."""
+
+import copy
+import datetime
+import functools
+import hashlib
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from joblib import Memory
+from joblib import hash as joblib_hash
+from joblib.disk import memstr_to_bytes
+from joblib.func_inspect import filter_args, get_func_code
+from nibabel.arrayproxy import is_proxy
+from nibabel.spatialimages import SpatialImage
+
+from nilearn._utils.docs import fill_doc
+
+
+def _to_bytes(limit):
+    """Convert a size limit given as a str (for example '1G') to bytes."""
+    if isinstance(limit, str):
+        return memstr_to_bytes(limit)
+    return limit
+
+
+def _nbytes(obj):
+    """Estimate the memory footprint of a cached result."""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, SpatialImage):
+        dataobj = obj.dataobj
+        n_bytes = 0 if is_proxy(dataobj) else np.asarray(dataobj).nbytes
+        return n_bytes + _nbytes(obj.affine)
+    if isinstance(obj, (list, tuple)):
+        return sum(_nbytes(item) for item in obj)
+    if isinstance(obj, dict):
+        return sum(_nbytes(item) for item in obj.values())
+    if hasattr(obj, "memory_usage"):
+        # pandas DataFrame or Series
+        return int(np.sum(obj.memory_usage(deep=False)))
+    return sys.getsizeof(obj)
+
+
+def _file_key(path):
+    """Return a key identifying the content of a file, or None."""
+    try:
+        stat = Path(path).stat()
+    except (OSError, ValueError):
+        return None
+    if not Path(path).is_file():
+        return None
+    return ("file", str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def content_key(obj):
+    """Return a cheap key identifying the content of a function argument.
+
+    Files are identified by their path, modification time and size,
+    and images whose data has not been loaded from their file
+    are identified by their file and a hash of their header and affine,
+    instead of hashing their data.
+    The result is hashed with :func:`joblib.hash`.
+
+    Parameters
+    ----------
+    obj : any
+        Argument of a cached function.
+
+    Returns
+    -------
+    key : :obj:`str`
+        Key identifying ``obj``.
+    """
+    return joblib_hash(_content_token(obj))
+
+
+def _content_token(obj):
+    """Replace files and images read from files by their content keys."""
+    if isinstance(obj, (str, Path)):
+        file_key = _file_key(obj) if str(obj) else None
+        return obj if file_key is None else file_key
+
+    if isinstance(obj, SpatialImage) and is_proxy(obj.dataobj):
+        filename = obj.get_filename()
+        file_key = None if filename is None else _file_key(filename)
+        if file_key is not None:
+            header = hashlib.sha1(obj.header.binaryblock).hexdigest()
+            return (
+                type(obj).__name__,
+                file_key,
+                header,
+                obj.affine,
+            )
+
+    if type(obj) in (list, tuple):
+        return type(obj)(_content_token(item) for item in obj)
+
+    if type(obj) is dict:
+        return {key: _content_token(value) for key, value in obj.items()}
+
+    return obj
+
+
+def _read_only(obj):
+    """Return obj with read-only views of its arrays."""
+    if isinstance(obj, np.ndarray):
+        view = obj.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(obj, (list, tuple)) and type(obj) in (list, tuple):
+        return type(obj)(_read_only(item) for item in obj)
+    if type(obj) is dict:
+        return {key: _read_only(value) for key, value in obj.items()}
+    return obj
+
+
+def _unshared(obj):
+    """Copy the parts of a cached result that callers could modify.
+
+    Arrays are read-only and are not copied.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj
+    if isinstance(obj, (list, tuple)) and type(obj) in (list, tuple):
+        return type(obj)(_unshared(item) for item in obj)
+    if type(obj) is dict:
+        return {key: _unshared(value) for key, value in obj.items()}
+    return copy.deepcopy(obj)
+
+
+class _LRUCache:
+    """Thread-safe least recently used cache bounded in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        """Return (True, value) if key is cached, else (False, None)."""
+        with self._lock:
+            if key not in self._items:
+                return False, None
+            self._items.move_to_end(key)
+            return True, self._items[key][0]
+
+    def put(self, key, value):
+        """Add a value, evicting the least recently used ones if needed."""
+        n_bytes = _nbytes(value)
+        if n_bytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.n_bytes -= self._items.pop(key)[1]
+            self._items[key] = (value, n_bytes)
+            self.n_bytes += n_bytes
+            while self.n_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._items.popitem(last=False)
+                self.n_bytes -= evicted_bytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.n_bytes = 0
+
+
+def _func_id(func):
+    """Identify a function by its name and the hash of its code.
+
+    Callable objects are identified by their type and their content.
+    """
+    func = getattr(func, "__func__", func)
+    if not inspect.isfunction(func):
+        return (type(func).__module__, type(func).__qualname__, func)
+    return _function_id(func)
+
+
+@functools.lru_cache(maxsize=256)
+def _function_id(func):
+    code, source_file, _ = get_func_code(func)
+    return (func.__module__, func.__qualname__, source_file, joblib_hash(code))
+
+
+def _named_call(func):
+    """Return a function calling its arguments, named after func."""
+
+    def call(key, func, args, kwargs):  # noqa: ARG001
+        return func(*args, **kwargs)
+
+    name = getattr(func, "__name__", type(func).__name__)
+    call.__module__ = func.__module__
+    call.__name__ = name
+    call.__qualname__ = getattr(func, "__qualname__", name)
+    return call
+
+
+@fill_doc
+class TieredMemory(Memory):
+    """Cache results in memory and on disk.
+
+    This is a :class:`joblib.Memory` that keeps the most recently used
+    results in a bounded in-process cache,
+    in front of the joblib store on disk.
+    It can be passed as the ``memory`` parameter of nilearn estimators
+    and functions.
+
+    Repeated calls on the same inputs are served from memory
+    without hashing or unpickling large arrays:
+    the arguments are identified by cheap content keys,
+    images read from files being identified
+    by their path, modification time, size and header
+    instead of their voxel data.
+
+    Arrays in results cached in memory are read-only,
+    as when :class:`joblib.Memory` uses ``mmap_mode="r"``.
+
+    Results on disk can be evicted by total size, number of items
+    or age, every time a new result is stored.
+
+    .. nilearn_versionadded:: 0.14.1
+
+    Parameters
+    ----------
+    location : None, :obj:`str` or :class:`pathlib.Path`, default=None
+        Path of the disk cache.
+        If None, results are only cached in memory.
+
+    max_memory_bytes : :obj:`int` or :obj:`str`, default="512M"
+        Maximum size of the results cached in memory.
+        A :obj:`str` such as ``"1G"`` can be given.
+        If 0, results are only cached on disk.
+        Results larger than this are never cached in memory.
+
+    max_disk_bytes : :obj:`int`, :obj:`str` or None, default=None
+        Maximum size of the disk cache.
+        The least recently accessed results are removed first.
+
+    max_disk_items : :obj:`int` or None, default=None
+        Maximum number of results in the disk cache.
+        The least recently accessed results are removed first.
+
+    max_disk_age : :class:`datetime.timedelta`, :obj:`float` or None, \
+                   default=None
+        Results accessed longer ago than this
+        (in seconds if a :obj:`float` is given)
+        are removed from the disk cache.
+
+    %(verbose0)s
+
+    kwargs : keyword arguments, optional
+        Other keyword arguments passed to :class:`joblib.Memory`.
+
+    Notes
+    -----
+    The file system must record access times
+    for eviction to favor recently accessed results on disk.
+
+    Content keys assume that files are not modified
+    without changing their modification time or size.
+    """
+
+    def __init__(
+        self,
+        location=None,
+        max_memory_bytes="512M",
+        max_disk_bytes=None,
+        max_disk_items=None,
+        max_disk_age=None,
+        verbose=0,
+        **kwargs,
+    ):
+        super().__init__(location=location, verbose=verbose, **kwargs)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_disk_items = max_disk_items
+        self.max_disk_age = max_disk_age
+        self._lru = _LRUCache(_to_bytes(max_memory_bytes))
+
+    def __getstate__(self):
+        # The in-memory tier is not shared with other processes.
+        state = super().__getstate__()
+        state["_lru"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lru = _LRUCache(_to_bytes(self.max_memory_bytes))
+
+    def cache(self, func=None, ignore=None, **kwargs):
+        """Decorate a function to cache its results in memory and on disk.
+
+        Parameters
+        ----------
+        func : callable or None, default=None
+            The function to decorate.
+
+        ignore : :obj:`list` of :obj:`str` or None, default=None
+            Names of arguments to ignore when identifying a call.
+
+        kwargs : keyword arguments, optional
+            Other keyword arguments passed to :meth:`joblib.Memory.cache`.
+
+        Returns
+        -------
+        decorated_func : callable
+            Object with the same interface as a
+            :class:`joblib.memory.MemorizedFunc`.
+        """
+        if func is None:
+            return functools.partial(self.cache, ignore=ignore, **kwargs)
+
+        # Disk results are stored under the name of func,
+        # but are looked up with the content key only.
+        disk_func = super().cache(
+            _named_call(func), ignore=["func", "args", "kwargs"], **kwargs
+        )
+        return _TieredFunc(self, func, disk_func, ignore or [])
+
+    def clear(self, warn=True):
+        """Erase the complete cache, in memory and on disk."""
+        self._lru.clear()
+        super().clear(warn=warn)
+
+    def reduce_disk_size(self):
+        """Remove results from the disk cache to fit its limits."""
+        if self.store_backend is None or (
+            self.max_disk_bytes is None
+            and self.max_disk_items is None
+            and self.max_disk_age is None
+        ):
+            return
+
+        items = self.store_backend.get_items()
+        to_delete = []
+        if self.max_disk_age is not None:
+            max_age = self.max_disk_age
+            if not isinstance(max_age, datetime.timedelta):
+                max_age = datetime.timedelta(seconds=max_age)
+            now = datetime.datetime.now()
+            to_delete = [
+                item for item in items if now - item.last_access > max_age
+            ]
+            items = [item for item in items if item not in to_delete]
+
+        items.sort(key=lambda item: item.last_access, reverse=True)
+        max_bytes = _to_bytes(self.max_disk_bytes)
+        n_bytes = 0
+        for i, item in enumerate(items):
+            n_bytes += item.size
+            if (max_bytes is not None and n_bytes > max_bytes) or (
+                self.max_disk_items is not None and i >= self.max_disk_items
+            ):
+                to_delete.append(item)
+
+        for item in to_delete:
+            self.store_backend.clear_location(item.path)
+
+
+class _TieredFunc:
+    """Callable looking up results in memory, then on disk."""
+
+    def __init__(self, memory, func, disk_func, ignore):
+        self.memory = memory
+        self.func = func
+        self.disk_func = disk_func
+        self.ignore = ignore
+        functools.update_wrapper(self, func)
+
+    def _key(self, args, kwargs):
+        arguments = filter_args(self.func, self.ignore, args, kwargs)
+        return content_key((_func_id(self.func), arguments))
+
+    def __call__(self, *args, **kwargs):
+        key = self._key(args, kwargs)
+        found, result = self.memory._lru.get(key)
+        if not found:
+            result = _read_only(self.disk_func(key, self.func, args, kwargs))
+            self.memory.reduce_disk_size()
+            self.memory._lru.put(key, result)
+        return _unshared(result)
+
+    def check_call_in_cache(self, *args, **kwargs):
+        """Check if the result of a call is cached in memory or on disk."""
+        key = self._key(args, kwargs)
+        found, _ = self.memory._lru.get(key)
+        return found or self.disk_func.check_call_in_cache(
+            key, self.func, args, kwargs
+        )
+
+    def call_and_shelve(self, *args, **kwargs):
+        """Call the function and return a reference to the result on disk."""
+        key = self._key(args, kwargs)
+        result = self.disk_func.call_and_shelve(key, self.func, args, kwargs)
+        self.memory.reduce_disk_size()
+        return result
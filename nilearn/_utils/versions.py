@@ -3,6 +3,7 @@
 import operator
 from typing import Literal
 
+from joblib import __version__ as joblib_version
 from packaging.version import Version, parse
 from sklearn import __version__ as sklearn_version
 
@@ -69,6 +70,8 @@ def compare_version(
     return VERSION_OPERATORS[operator](parse(version_a), parse(version_b))
 
 
+JOBLIB_GTE_1_3 = compare_version(joblib_version, ">=", "1.3.0")
+
 SKLEARN_LT_1_6 = compare_version(sklearn_version, "<", "1.6.0")
 SKLEARN_GTE_1_7 = compare_version(sklearn_version, ">=", "1.7.0")
 SKLEARN_GTE_1_8 = compare_version(sklearn_version, ">=", "1.8.0")
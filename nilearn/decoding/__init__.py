@@ -6,7 +6,7 @@ from nilearn.decoding.decoder import (
     FREMClassifier,
     FREMRegressor,
 )
-from nilearn.decoding.searchlight import SearchLight
+from nilearn.decoding.searchlight import SearchLight, SearchlightIndex
 from nilearn.decoding.space_net import SpaceNetClassifier, SpaceNetRegressor
 
 __all__ = [
@@ -15,6 +15,7 @@ __all__ = [
     "FREMClassifier",
     "FREMRegressor",
     "SearchLight",
+    "SearchlightIndex",
     "SpaceNetClassifier",
     "SpaceNetRegressor",
 ]
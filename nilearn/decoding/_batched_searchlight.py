@@ -0,0 +1,331 @@
+"""Batched cross-validated scoring of simple linear estimators \
+on searchlight spheres.
+
+Instead of refitting a scikit-learn estimator on each sphere,
+the spheres are grouped in batches of similar size,
+the data of all the spheres of a batch are gathered
+in a single padded 3D array,
+and the closed-form solutions of the estimators
+are computed for the whole batch with stacked-array calls.
+"""
+
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.linear_model import Ridge, RidgeClassifier
+from sklearn.model_selection import check_cv
+from sklearn.naive_bayes import GaussianNB
+from sklearn.preprocessing import LabelBinarizer
+
+from nilearn._utils import logger
+from nilearn._utils.logger import readable_time
+from nilearn._utils.versions import JOBLIB_GTE_1_3
+
+BATCHED_ESTIMATORS = (Ridge, RidgeClassifier, GaussianNB)
+
+_BATCHED_SCORING = {
+    "regressor": (None, "r2"),
+    "classifier": (None, "accuracy"),
+}
+
+
+def _estimator_kind(estimator):
+    return "regressor" if type(estimator) is Ridge else "classifier"
+
+
+def check_batched_estimator(estimator, scoring, y) -> None:
+    """Check that the batched searchlight engine supports this setting.
+
+    Parameters
+    ----------
+    estimator : scikit-learn estimator
+        Estimator to check.
+
+    scoring : :obj:`str` or None
+        Scoring strategy.
+
+    y : array-like or None
+        Target variable.
+
+    Raises
+    ------
+    ValueError
+        If the estimator, its parameters, the scoring or the target
+        are not supported by the batched engine.
+    """
+    if type(estimator) not in BATCHED_ESTIMATORS:
+        raise ValueError(
+            "engine='batched' only supports estimators of type "
+            f"{[e.__name__ for e in BATCHED_ESTIMATORS]}. "
+            f"Got: {estimator.__class__.__name__}. "
+            "Use engine='generic' instead."
+        )
+
+    if y is None:
+        raise ValueError("engine='batched' requires a target 'y'.")
+
+    if np.asarray(y).ndim != 1:
+        raise ValueError(
+            "engine='batched' only supports 1D targets. "
+            f"Got 'y' with shape {np.asarray(y).shape}."
+        )
+
+    kind = _estimator_kind(estimator)
+    if scoring not in _BATCHED_SCORING[kind]:
+        raise ValueError(
+            f"engine='batched' only supports scoring in "
+            f"{_BATCHED_SCORING[kind]} for {estimator.__class__.__name__}. "
+            f"Got: {scoring!r}."
+        )
+
+    if isinstance(estimator, (Ridge, RidgeClassifier)):
+        if not np.isscalar(estimator.alpha):
+            raise ValueError(
+                "engine='batched' only supports a scalar 'alpha'. "
+                f"Got: {estimator.alpha!r}."
+            )
+        if estimator.positive:
+            raise ValueError(
+                "engine='batched' does not support 'positive=True'."
+            )
+    if (
+        isinstance(estimator, RidgeClassifier)
+        and estimator.class_weight is not None
+    ):
+        raise ValueError("engine='batched' does not support 'class_weight'.")
+
+
+def _make_batches(sphere_sizes, batch_size):
+    """Group spheres of similar sizes in batches.
+
+    Sorting the spheres by size before splitting them
+    minimizes the amount of padding in each batch.
+    """
+    order = np.argsort(sphere_sizes, kind="stable")
+    return [
+        order[start : start + batch_size]
+        for start in range(0, len(order), batch_size)
+    ]
+
+
+def _gather(X, rows, sphere_indices):
+    """Gather the data of a batch of spheres in a padded 3D array.
+
+    Returns
+    -------
+    X_batch : ndarray of shape (n_spheres, n_samples, max_sphere_size)
+        Data of each sphere, padded with zero columns.
+
+    valid : ndarray of shape (n_spheres, max_sphere_size)
+        True for columns that are not padding.
+    """
+    sizes = np.array([len(rows[i]) for i in sphere_indices])
+    max_size = max(int(sizes.max()), 1)
+    valid = np.arange(max_size) < sizes[:, np.newaxis]
+    # index n_features points to an extra column of zeros
+    idx = np.full((len(sphere_indices), max_size), X.shape[1])
+    idx[valid] = np.concatenate([rows[i] for i in sphere_indices])
+    X_ext = np.hstack([X, np.zeros((X.shape[0], 1), dtype=X.dtype)])
+    return np.transpose(X_ext[:, idx], (1, 0, 2)), valid
+
+
+def _ridge_predict(X_train, Y_train, X_test, alpha, fit_intercept):
+    """Fit and predict ridge regressions on a batch of spheres.
+
+    The primal or dual closed-form solution is used
+    depending on which one needs the smallest system to be solved.
+    Zero padded columns do not change the solution.
+
+    Parameters
+    ----------
+    X_train : ndarray of shape (n_spheres, n_train, n_features)
+
+    Y_train : ndarray of shape (n_train, n_targets)
+
+    X_test : ndarray of shape (n_spheres, n_test, n_features)
+
+    Returns
+    -------
+    Y_pred : ndarray of shape (n_spheres, n_test, n_targets)
+    """
+    Y_mean = np.zeros(Y_train.shape[1])
+    if fit_intercept:
+        X_mean = X_train.mean(axis=1, keepdims=True)
+        X_train = X_train - X_mean
+        X_test = X_test - X_mean
+        Y_mean = Y_train.mean(axis=0)
+        Y_train = Y_train - Y_mean
+
+    n_train, n_features = X_train.shape[1:]
+    X_train_t = np.transpose(X_train, (0, 2, 1))
+    if n_train <= n_features:
+        gram = X_train @ X_train_t
+        gram[:, np.arange(n_train), np.arange(n_train)] += alpha
+        dual_coef = np.linalg.solve(
+            gram, np.broadcast_to(Y_train, (len(gram), *Y_train.shape))
+        )
+        Y_pred = (X_test @ X_train_t) @ dual_coef
+    else:
+        gram = X_train_t @ X_train
+        gram[:, np.arange(n_features), np.arange(n_features)] += alpha
+        coef = np.linalg.solve(gram, X_train_t @ Y_train)
+        Y_pred = X_test @ coef
+
+    return Y_pred + Y_mean
+
+
+def _gaussian_nb_predict(X_train, y_train, X_test, valid, estimator):
+    """Fit and predict gaussian naive Bayes classifiers on a batch of spheres.
+
+    Returns
+    -------
+    y_pred : ndarray of shape (n_spheres, n_test)
+    """
+    classes, y_idx = np.unique(y_train, return_inverse=True)
+
+    theta = np.stack(
+        [X_train[:, y_idx == c].mean(axis=1) for c in range(len(classes))],
+        axis=1,
+    )
+    var = np.stack(
+        [X_train[:, y_idx == c].var(axis=1) for c in range(len(classes))],
+        axis=1,
+    )
+    # smoothing is relative to the largest variance of each sphere
+    epsilon = estimator.var_smoothing * X_train.var(axis=1).max(axis=1)
+    var += epsilon[:, np.newaxis, np.newaxis]
+    # padded columns must not contribute to the likelihood
+    var[~np.broadcast_to(valid[:, np.newaxis], var.shape)] = 1.0
+
+    if estimator.priors is None:
+        priors = np.bincount(y_idx) / len(y_idx)
+    else:
+        priors = np.asarray(estimator.priors)
+
+    n_ij = -0.5 * np.sum(
+        np.log(2.0 * np.pi * var) * valid[:, np.newaxis], axis=2
+    )
+    diff = X_test[:, :, np.newaxis, :] - theta[:, np.newaxis]
+    joint_log_likelihood = (
+        np.log(priors)
+        + n_ij[:, np.newaxis]
+        - 0.5
+        * np.sum(
+            diff**2 / var[:, np.newaxis] * valid[:, np.newaxis, np.newaxis],
+            axis=3,
+        )
+    )
+    return classes[np.argmax(joint_log_likelihood, axis=2)]
+
+
+def _r2_score(y_true, y_pred):
+    """Compute the R2 score of a batch of predictions.
+
+    Follows :func:`sklearn.metrics.r2_score` for constant targets.
+    """
+    numerator = ((y_true - y_pred) ** 2).sum(axis=1)
+    denominator = ((y_true - y_true.mean()) ** 2).sum()
+    if denominator == 0:
+        return np.where(numerator == 0, 1.0, 0.0)
+    return 1 - numerator / denominator
+
+
+def _score_batch(X, y, rows, sphere_indices, estimator, splits):
+    """Compute the mean cross-validated score of a batch of spheres."""
+    X_batch, valid = _gather(X, rows, sphere_indices)
+    scores = np.zeros((len(sphere_indices), len(splits)))
+
+    for i_fold, (train, test) in enumerate(splits):
+        X_train, X_test = X_batch[:, train], X_batch[:, test]
+        y_train, y_test = y[train], y[test]
+
+        if isinstance(estimator, GaussianNB):
+            y_pred = _gaussian_nb_predict(
+                X_train, y_train, X_test, valid, estimator
+            )
+            scores[:, i_fold] = np.mean(y_pred == y_test, axis=1)
+
+        elif isinstance(estimator, RidgeClassifier):
+            binarizer = LabelBinarizer(pos_label=1, neg_label=-1)
+            Y_train = binarizer.fit_transform(y_train).astype(np.float64)
+            decision = _ridge_predict(
+                X_train,
+                Y_train,
+                X_test,
+                estimator.alpha,
+                estimator.fit_intercept,
+            )
+            if decision.shape[2] == 1:
+                y_pred = binarizer.classes_[(decision[..., 0] > 0).astype(int)]
+            else:
+                y_pred = binarizer.classes_[np.argmax(decision, axis=2)]
+            scores[:, i_fold] = np.mean(y_pred == y_test, axis=1)
+
+        else:
+            y_pred = _ridge_predict(
+                X_train,
+                y_train[:, np.newaxis].astype(np.float64),
+                X_test,
+                estimator.alpha,
+                estimator.fit_intercept,
+            )[..., 0]
+            scores[:, i_fold] = _r2_score(y_test, y_pred)
+
+    return scores.mean(axis=1)
+
+
+def batched_search_light(
+    X,
+    y,
+    estimator,
+    A,
+    groups=None,
+    cv=None,
+    n_jobs=1,
+    verbose=0,
+    batch_size=256,
+):
+    """Compute searchlight scores with the batched engine.
+
+    See :func:`nilearn.decoding.searchlight.search_light`
+    for a description of the parameters.
+
+    batch_size : :obj:`int`, default=256
+        Number of spheres processed together.
+
+    Returns
+    -------
+    scores : ndarray of shape (n_spheres,)
+        Mean cross-validated score of each sphere.
+    """
+    y = np.asarray(y)
+    rows = A.rows
+    kind = _estimator_kind(estimator)
+    cv = check_cv(cv, y, classifier=kind == "classifier")
+    splits = list(cv.split(X, y, groups))
+
+    batches = _make_batches(np.array([len(r) for r in rows]), batch_size)
+
+    t0 = time.time()
+    scores = np.zeros(len(rows))
+    parallel_kwargs = {"return_as": "generator"} if JOBLIB_GTE_1_3 else {}
+    results = Parallel(n_jobs=n_jobs, prefer="threads", **parallel_kwargs)(
+        delayed(_score_batch)(X, y, rows, batch, estimator, splits)
+        for batch in batches
+    )
+    for i, (batch, batch_scores) in enumerate(
+        zip(batches, results, strict=True)
+    ):
+        scores[batch] = batch_scores
+        if verbose > 0:
+            percent = 100.0 * (i + 1) / len(batches)
+            dt = time.time() - t0
+            remaining = (100.0 - percent) / percent * dt
+            logger.log(
+                f"Processed {i + 1}/{len(batches)} batches of spheres "
+                f"({percent:0.2f}%, {readable_time(remaining)} remaining)",
+                verbose,
+            )
+
+    return scores
@@ -10,7 +10,9 @@ from copy import deepcopy
 from typing import Any
 
 import numpy as np
-from joblib import Parallel, cpu_count, delayed
+from joblib import Parallel, cpu_count, delayed, effective_n_jobs
+from nibabel import Nifti1Image
+from scipy import sparse
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.exceptions import ConvergenceWarning
 from sklearn.model_selection import KFold, cross_val_score
@@ -22,15 +24,27 @@ from nilearn._base import NilearnBaseEstimator
 from nilearn._utils import logger
 from nilearn._utils.docs import fill_doc
 from nilearn._utils.logger import readable_time
-from nilearn._utils.param_validation import check_params
-from nilearn._utils.versions import SKLEARN_LT_1_6
+from nilearn._utils.param_validation import (
+    check_parameter_in_allowed,
+    check_params,
+)
+from nilearn._utils.versions import JOBLIB_GTE_1_3, SKLEARN_LT_1_6
+from nilearn.decoding._batched_searchlight import (
+    batched_search_light,
+    check_batched_estimator,
+)
 from nilearn.decoding._utils import SUPPORTED_ESTIMATORS, validate_estimator
 from nilearn.image import check_niimg_3d, check_niimg_4d, new_img_like
+from nilearn.image.image import check_same_fov
 from nilearn.image.resampling import coord_transform
 from nilearn.maskers.nifti_spheres_masker import apply_mask_and_get_affinity
-from nilearn.masking import load_mask_img
+from nilearn.masking import apply_mask_fmri, load_mask_img
 from nilearn.nilearn_typing import SupportedClassifiers, SupportedRegressors
 
+# Number of chunks of spheres dispatched per job
+# to balance the load between workers.
+_CHUNKS_PER_JOB = 8
+
 
 def _check_searchlight_estimator(estimator, *, scoring, y):
     """Validate estimator for nilearn.decoding.SearchLight."""
@@ -94,6 +108,7 @@ def search_light(
     cv=None,
     n_jobs=-1,
     verbose=0,
+    engine="generic",
 ):
     """Compute a search_light.
 
@@ -108,7 +123,7 @@ def search_light(
     estimator : scikit-learn compatible estimator object
         Object to use to fit the data.
 
-    A : scipy sparse matrix.
+    A : scipy sparse matrix or :class:`SearchlightIndex`.
         adjacency matrix. Defines for each feature the neighboring features
         following a given structure of the data.
 
@@ -128,15 +143,44 @@ def search_light(
 
     %(verbose0)s
 
+    %(searchlight_engine)s
+
     Returns
     -------
     scores : array-like of shape (number of rows in A)
         search_light scores
     """
     check_params(locals())
+    check_parameter_in_allowed(engine, ("generic", "batched"), "engine")
+
+    if isinstance(A, SearchlightIndex):
+        A = A.A_
+
+    if engine == "batched":
+        check_batched_estimator(estimator, scoring, y)
+        return batched_search_light(
+            X,
+            y,
+            estimator,
+            A,
+            groups=groups,
+            cv=cv,
+            n_jobs=n_jobs,
+            verbose=verbose,
+        )
 
-    group_iter = GroupIterator(A.shape[0], n_jobs)
-    scores = Parallel(n_jobs=n_jobs, verbose=verbose)(
+    # Split the spheres in many chunks of similar total sphere size
+    # so that workers that finish early can pick up the remaining chunks.
+    sphere_sizes = np.fromiter((len(row) for row in A.rows), dtype=int)
+    n_chunks = min(A.shape[0], _CHUNKS_PER_JOB * effective_n_jobs(n_jobs))
+    chunks = [
+        list_i
+        for list_i in GroupIterator(A.shape[0], n_chunks, weights=sphere_sizes)
+        if len(list_i) > 0
+    ]
+
+    parallel_kwargs = {"return_as": "generator"} if JOBLIB_GTE_1_3 else {}
+    results = Parallel(n_jobs=n_jobs, verbose=verbose, **parallel_kwargs)(
         delayed(_group_iter_search_light)(
             A.rows[list_i],
             estimator,
@@ -145,13 +189,207 @@ def search_light(
             groups,
             scoring,
             cv,
-            thread_id + 1,
+            chunk_id + 1,
             A.shape[0],
+        )
+        for chunk_id, list_i in enumerate(chunks)
+    )
+
+    logger.log(
+        f"Scoring {A.shape[0]} spheres in {len(chunks)} chunks",
+        verbose,
+        msg_level=2,
+    )
+    if len(sphere_sizes) > 0:
+        logger.log(
+            f"Number of voxels per sphere: min={sphere_sizes.min()}, "
+            f"max={sphere_sizes.max()}, mean={sphere_sizes.mean():0.1f}",
             verbose,
+            msg_level=3,
         )
-        for thread_id, list_i in enumerate(group_iter)
+    scores = np.zeros(A.shape[0])
+    total_work = max(sphere_sizes.sum(), 1)
+    work_done = 0
+    t0 = time.time()
+    for i, (list_i, chunk_scores) in enumerate(
+        zip(chunks, results, strict=True)
+    ):
+        scores[list_i] = chunk_scores
+        work_done += sphere_sizes[list_i].sum()
+        if verbose > 0:
+            percent = 100.0 * work_done / total_work
+            dt = time.time() - t0
+            # We use a max to avoid a division by zero
+            remaining = (100.0 - percent) / max(0.01, percent) * dt
+            logger.log(
+                f"Processed {i + 1}/{len(chunks)} chunks of spheres "
+                f"({percent:0.2f}%, {readable_time(remaining)} remaining)",
+                verbose,
+            )
+    return scores
+
+
+def _get_seeds(process_mask_img):
+    """Return the process mask and the world coordinates of its voxels."""
+    process_mask, process_mask_affine = load_mask_img(process_mask_img)
+    process_mask_coords = np.where(process_mask != 0)
+    process_mask_coords = coord_transform(
+        process_mask_coords[0],
+        process_mask_coords[1],
+        process_mask_coords[2],
+        process_mask_affine,
     )
-    return np.concatenate(scores)
+    return process_mask, np.asarray(process_mask_coords).T
+
+
+class SearchlightIndex:
+    """Precomputed neighborhoods of the spheres of a searchlight.
+
+    The sparse adjacency matrix between the sphere centers
+    and the voxels of the mask only depends on
+    ``mask_img``, ``process_mask_img`` and ``radius``.
+    It can be computed once, saved to disk with :meth:`save`,
+    and reused for many subjects by passing it to
+    :class:`SearchLight` or :func:`search_light`.
+
+    .. nilearn_versionadded:: 0.14.1
+
+    Parameters
+    ----------
+    mask_img : Niimg-like object
+        See :ref:`extracting_data`.
+        Boolean image giving location of voxels containing usable signals.
+
+    process_mask_img : Niimg-like object or None, default=None
+        See :ref:`extracting_data`.
+        Boolean image giving voxels on which searchlight should be
+        computed. If None, ``mask_img`` is used.
+
+    radius : :obj:`float`, default=2.
+        radius of the searchlight ball, in millimeters.
+
+    Attributes
+    ----------
+    A_ : :class:`scipy.sparse.lil_matrix`
+        Boolean adjacency matrix
+        of shape (n_spheres, number of voxels in ``mask_img``).
+
+    mask_img_ : :class:`~nibabel.nifti1.Nifti1Image`
+        Binary mask of the voxels containing usable signals.
+
+    process_mask_ : :class:`numpy.ndarray`
+        Boolean 3D array of the voxels on which spheres are centered.
+
+    sphere_sizes_ : :class:`numpy.ndarray`
+        Number of voxels in each sphere.
+    """
+
+    def __init__(self, mask_img, process_mask_img=None, radius=2.0):
+        self.radius = radius
+
+        mask_img = check_niimg_3d(mask_img)
+        mask, affine = load_mask_img(mask_img)
+        self.mask_img_ = new_img_like(mask_img, mask.astype("uint8"), affine)
+
+        if process_mask_img is None:
+            process_mask_img = self.mask_img_
+        process_mask_img = check_niimg_3d(process_mask_img)
+        self.process_mask_, seeds = _get_seeds(process_mask_img)
+
+        _, A = apply_mask_and_get_affinity(
+            seeds, None, radius, True, mask_img=self.mask_img_
+        )
+        self.A_ = A
+        self.sphere_sizes_ = np.fromiter(
+            (len(row) for row in A.rows), dtype=int, count=A.shape[0]
+        )
+
+    @property
+    def n_spheres(self) -> int:
+        """Return the number of spheres."""
+        return self.A_.shape[0]
+
+    def size_statistics(self) -> dict[str, float]:
+        """Return statistics on the number of voxels per sphere.
+
+        Returns
+        -------
+        :obj:`dict`
+            With keys ``"n_spheres"``, ``"total"``, ``"min"``, ``"max"``,
+            ``"mean"``, ``"median"`` and ``"std"``.
+        """
+        sizes = self.sphere_sizes_
+        return {
+            "n_spheres": int(sizes.size),
+            "total": int(sizes.sum()),
+            "min": int(sizes.min()),
+            "max": int(sizes.max()),
+            "mean": float(sizes.mean()),
+            "median": float(np.median(sizes)),
+            "std": float(sizes.std()),
+        }
+
+    def save(self, filename) -> None:
+        """Save the index to a compressed ``.npz`` file.
+
+        Only the CSR structure of the adjacency matrix,
+        the masks and their affine are stored.
+
+        Parameters
+        ----------
+        filename : :obj:`str` or :obj:`pathlib.Path`
+            Output file.
+        """
+        A = self.A_.tocsr()
+        mask = np.asarray(self.mask_img_.dataobj, dtype=bool)
+        np.savez_compressed(
+            filename,
+            indices=A.indices.astype(np.int32),
+            indptr=A.indptr.astype(np.int64),
+            shape=np.asarray(A.shape),
+            radius=self.radius,
+            affine=self.mask_img_.affine,
+            mask=np.packbits(mask),
+            mask_shape=np.asarray(mask.shape),
+            process_mask=np.packbits(self.process_mask_),
+        )
+
+    @classmethod
+    def load(cls, filename) -> "SearchlightIndex":
+        """Load an index saved with :meth:`save`.
+
+        Parameters
+        ----------
+        filename : :obj:`str` or :obj:`pathlib.Path`
+            File to load.
+
+        Returns
+        -------
+        :class:`SearchlightIndex`
+        """
+        with np.load(filename) as data:
+            mask_shape = tuple(data["mask_shape"])
+            n_voxels = int(np.prod(mask_shape))
+            mask = np.unpackbits(data["mask"], count=n_voxels)
+            process_mask = np.unpackbits(data["process_mask"], count=n_voxels)
+            A = sparse.csr_matrix(
+                (
+                    np.ones(len(data["indices"]), dtype=bool),
+                    data["indices"],
+                    data["indptr"],
+                ),
+                shape=tuple(data["shape"]),
+            )
+
+            index = cls.__new__(cls)
+            index.radius = float(data["radius"])
+            index.mask_img_ = Nifti1Image(
+                mask.reshape(mask_shape), data["affine"]
+            )
+        index.process_mask_ = process_mask.reshape(mask_shape).astype(bool)
+        index.A_ = A.tolil()
+        index.sphere_sizes_ = np.diff(A.indptr)
+        return index
 
 
 @fill_doc
@@ -167,17 +405,37 @@ class GroupIterator:
         Total number of features
     %(n_jobs)s
 
+    weights : array-like of shape (n_features,) or None, default=None
+        Cost of processing each feature, for example the size
+        of the searchlight sphere centered on it.
+        If not None, features are split so that all groups
+        have approximately the same total weight,
+        instead of the same number of features.
+
+        .. nilearn_versionadded:: 0.14.1
+
     """
 
-    def __init__(self, n_features, n_jobs=1):
+    def __init__(self, n_features, n_jobs=1, weights=None):
         self.n_features = n_features
         if n_jobs == -1:
             n_jobs = cpu_count()
         self.n_jobs = n_jobs
+        self.weights = weights
         check_params(self.__dict__)
 
     def __iter__(self):
-        yield from np.array_split(np.arange(self.n_features), self.n_jobs)
+        if self.weights is None or self.n_features == 0:
+            yield from np.array_split(np.arange(self.n_features), self.n_jobs)
+            return
+
+        cumulative_weights = np.cumsum(np.asarray(self.weights, dtype=float))
+        bounds = np.searchsorted(
+            cumulative_weights,
+            np.linspace(0, cumulative_weights[-1], self.n_jobs + 1)[1:-1],
+            side="right",
+        )
+        yield from np.split(np.arange(self.n_features), bounds)
 
 
 @fill_doc
@@ -351,6 +609,19 @@ class SearchLight(TransformerMixin, NilearnBaseEstimator):
 
     %(estimator_args)s
 
+    %(searchlight_engine)s
+        Only used in ``fit``: ``transform`` always uses
+        the ``"generic"`` engine.
+
+    searchlight_index : :class:`SearchlightIndex` or None, default=None
+        Precomputed neighborhoods of the spheres.
+        If not None, ``mask_img``, ``process_mask_img`` and ``radius``
+        are ignored and taken from the index,
+        and the images passed to ``fit`` and ``transform``
+        must be in the same space as the mask of the index.
+
+        .. nilearn_versionadded:: 0.14.1
+
     Attributes
     ----------
     mask_img_ : Nifti1Image or :obj:`~nilearn.surface.SurfaceImage`
@@ -410,6 +681,8 @@ class SearchLight(TransformerMixin, NilearnBaseEstimator):
         verbose=0,
         random_state=0,
         estimator_args=None,
+        engine="generic",
+        searchlight_index=None,
     ):
         self.mask_img = mask_img
         self.process_mask_img = process_mask_img
@@ -421,6 +694,8 @@ class SearchLight(TransformerMixin, NilearnBaseEstimator):
         self.verbose = verbose
         self.random_state = random_state
         self.estimator_args = estimator_args
+        self.engine = engine
+        self.searchlight_index = searchlight_index
 
     def __sklearn_tags__(self):
         """Return estimator tags.
@@ -498,39 +773,37 @@ class SearchLight(TransformerMixin, NilearnBaseEstimator):
 
         check_array(y, ensure_2d=False, dtype=None)
 
-        # Get the seeds
-        self.mask_img_ = deepcopy(self.mask_img)
-        if self.mask_img_ is not None:
-            self.mask_img_ = check_niimg_3d(self.mask_img_)
+        if self.searchlight_index is not None:
+            self.mask_img_ = self.searchlight_index.mask_img_
+            self.process_mask_ = self.searchlight_index.process_mask_
+            self.n_elements_ = self.process_mask_.ravel().sum()
+            X, A = self._apply_index(imgs)
+        else:
+            # Get the seeds
+            self.mask_img_ = deepcopy(self.mask_img)
+            if self.mask_img_ is not None:
+                self.mask_img_ = check_niimg_3d(self.mask_img_)
 
-        if self.process_mask_img is not None:
-            check_niimg_3d(self.process_mask_img)
+            if self.process_mask_img is not None:
+                check_niimg_3d(self.process_mask_img)
 
-        process_mask_img = self.process_mask_img or self.mask_img_
+            process_mask_img = self.process_mask_img or self.mask_img_
 
-        # Compute world coordinates of the seeds
-        process_mask, process_mask_affine = load_mask_img(process_mask_img)
+            # Compute world coordinates of the seeds
+            self.process_mask_, process_mask_coords = _get_seeds(
+                process_mask_img
+            )
 
-        self.process_mask_ = process_mask
+            self.n_elements_ = self.process_mask_.ravel().sum()
 
-        self.n_elements_ = process_mask.ravel().sum()
-
-        process_mask_coords = np.where(process_mask != 0)
-        process_mask_coords = coord_transform(
-            process_mask_coords[0],
-            process_mask_coords[1],
-            process_mask_coords[2],
-            process_mask_affine,
-        )
-        process_mask_coords = np.asarray(process_mask_coords).T
-
-        X, A = apply_mask_and_get_affinity(
-            process_mask_coords,
-            imgs,
-            self.radius,
-            True,
-            mask_img=self.mask_img_,
-        )
+            X, A = apply_mask_and_get_affinity(
+                process_mask_coords,
+                imgs,
+                self.radius,
+                True,
+                mask_img=self.mask_img_,
+            )
+        process_mask = self.process_mask_
 
         # TODO (sklearn >= 1.8) _estimator_type will be removed
         owning_class_type = getattr(self, "_estimator_type", None)
@@ -558,12 +831,23 @@ class SearchLight(TransformerMixin, NilearnBaseEstimator):
             self.cv,
             self.n_jobs,
             self.verbose,
+            engine=self.engine,
         )
         self.masked_scores_ = scores
         self.scores_ = np.zeros(process_mask.shape)
         self.scores_[np.where(process_mask)] = scores
         return self
 
+    def _apply_index(self, imgs):
+        """Mask the images with the mask of the searchlight index."""
+        if not check_same_fov(imgs, self.searchlight_index.mask_img_):
+            raise ValueError(
+                "The images must have the same shape and affine "
+                "as the mask of the searchlight index."
+            )
+        X = apply_mask_fmri(imgs, self.searchlight_index.mask_img_)
+        return X, self.searchlight_index.A_
+
     def __sklearn_is_fitted__(self) -> bool:
         return (
             hasattr(self, "scores_")
@@ -596,13 +880,16 @@ class SearchLight(TransformerMixin, NilearnBaseEstimator):
 
         imgs = check_niimg_4d(imgs)
 
-        X, A = apply_mask_and_get_affinity(
-            np.asarray(np.where(self.process_mask_)).T,
-            imgs,
-            self.radius,
-            True,
-            mask_img=self.mask_img_,
-        )
+        if self.searchlight_index is not None:
+            X, A = self._apply_index(imgs)
+        else:
+            X, A = apply_mask_and_get_affinity(
+                np.asarray(np.where(self.process_mask_)).T,
+                imgs,
+                self.radius,
+                True,
+                mask_img=self.mask_img_,
+            )
 
         # TODO (sklearn >= 1.8) _estimator_type will be removed
         owning_class_type = getattr(self, "_estimator_type", None)
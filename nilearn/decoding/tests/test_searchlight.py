@@ -4,7 +4,9 @@ import numpy as np
 import pytest
 from nibabel import Nifti1Image
 from sklearn.base import BaseEstimator
+from sklearn.linear_model import Ridge, RidgeClassifier
 from sklearn.model_selection import KFold, LeaveOneGroupOut
+from sklearn.naive_bayes import GaussianNB
 from sklearn.utils.estimator_checks import parametrize_with_checks
 
 from nilearn._utils.estimator_checks import (
@@ -513,3 +515,149 @@ def test_searchlight_estimator_type_plain_base_estimator():
     assert not searchlight.SearchLight(
         estimator=_NoCVEstimator()
     )._estimator_type
+
+
+@pytest.mark.parametrize(
+    "estimator, target",
+    [
+        (Ridge(), "continuous"),
+        (Ridge(alpha=10.0, fit_intercept=False), "continuous"),
+        (RidgeClassifier(), "binary"),
+        (RidgeClassifier(alpha=0.1), "multiclass"),
+        (GaussianNB(), "binary"),
+        (GaussianNB(var_smoothing=1e-3), "multiclass"),
+    ],
+)
+@pytest.mark.parametrize("radius", [0.5, 1.5])
+def test_searchlight_batched_engine(rng, estimator, target, radius):
+    """Check batched engine gives the same scores as the generic one."""
+    frames = 24
+    data_img, cond, mask_img = _make_searchlight_test_data(frames)
+    y = {
+        "continuous": rng.standard_normal(frames),
+        "binary": cond,
+        "multiclass": np.arange(frames) % 3,
+    }[target]
+
+    scores = {}
+    for engine in ["generic", "batched"]:
+        sl = searchlight.SearchLight(
+            mask_img,
+            radius=radius,
+            estimator=estimator,
+            cv=KFold(n_splits=4),
+            engine=engine,
+        )
+        with pytest.warns(UserWarning, match="Use a custom estimator"):
+            sl.fit(data_img, y)
+        scores[engine] = sl.scores_
+
+    np.testing.assert_allclose(scores["batched"], scores["generic"])
+
+
+def test_searchlight_batched_engine_errors():
+    """Check errors for settings not supported by the batched engine."""
+    frames = 12
+    data_img, cond, mask_img = _make_searchlight_test_data(frames)
+
+    with pytest.raises(ValueError, match="only supports estimators"):
+        searchlight.SearchLight(mask_img, engine="batched").fit(data_img, cond)
+
+    with (
+        pytest.warns(UserWarning, match="Use a custom estimator"),
+        pytest.raises(ValueError, match="only supports scoring"),
+    ):
+        searchlight.SearchLight(
+            mask_img,
+            estimator=RidgeClassifier(),
+            scoring="roc_auc",
+            engine="batched",
+        ).fit(data_img, cond)
+
+    with pytest.raises(ValueError, match="'engine' must be one of"):
+        searchlight.SearchLight(mask_img, engine="foo").fit(data_img, cond)
+
+
+def test_group_iterator_weights():
+    """Check that weighted groups have similar total weights."""
+    weights = np.array([10, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1])
+    groups = list(searchlight.GroupIterator(len(weights), 2, weights=weights))
+
+    assert len(groups) == 2
+    np.testing.assert_array_equal(np.concatenate(groups), np.arange(11))
+    np.testing.assert_array_equal(groups[0], [0])
+
+
+def test_searchlight_index(tmp_path):
+    """Check the index matches the adjacency computed by SearchLight."""
+    frames = 20
+    data_img, cond, mask_img = _make_searchlight_test_data(frames)
+    process_mask = np.zeros((5, 5, 5), dtype="uint8")
+    process_mask[1:4, 1:4, 1:4] = 1
+    process_mask_img = Nifti1Image(process_mask, np.eye(4))
+
+    index = searchlight.SearchlightIndex(
+        mask_img, process_mask_img=process_mask_img, radius=1.5
+    )
+
+    assert index.n_spheres == 27
+    stats = index.size_statistics()
+    assert stats["n_spheres"] == 27
+    assert stats["max"] == 19
+    assert stats["total"] == index.sphere_sizes_.sum()
+
+    filename = tmp_path / "index.npz"
+    index.save(filename)
+    loaded = searchlight.SearchlightIndex.load(filename)
+
+    assert (loaded.A_ != index.A_).nnz == 0
+    np.testing.assert_array_equal(loaded.process_mask_, index.process_mask_)
+    np.testing.assert_array_equal(loaded.sphere_sizes_, index.sphere_sizes_)
+    np.testing.assert_array_equal(
+        loaded.mask_img_.get_fdata(), index.mask_img_.get_fdata()
+    )
+    assert loaded.radius == 1.5
+
+    cv = KFold(n_splits=4)
+    expected = searchlight.SearchLight(
+        mask_img,
+        process_mask_img=process_mask_img,
+        radius=1.5,
+        cv=cv,
+    ).fit(data_img, cond)
+    for idx in [index, loaded]:
+        sl = searchlight.SearchLight(searchlight_index=idx, cv=cv).fit(
+            data_img, cond
+        )
+        np.testing.assert_array_equal(sl.scores_, expected.scores_)
+        np.testing.assert_array_equal(sl.process_mask_, expected.process_mask_)
+
+
+def test_searchlight_index_fov_mismatch():
+    """Check error when images and index are not in the same space."""
+    data_img, cond, mask_img = _make_searchlight_test_data(12)
+    index = searchlight.SearchlightIndex(mask_img, radius=1.0)
+    data_img = Nifti1Image(data_img.get_fdata()[1:], data_img.affine)
+
+    with pytest.raises(ValueError, match="same shape and affine"):
+        searchlight.SearchLight(searchlight_index=index).fit(data_img, cond)
+
+
+def test_searchlight_chunks_progress(capsys):
+    """Check scores do not depend on the chunking and progress is logged."""
+    frames = 20
+    data_img, cond, mask_img = _make_searchlight_test_data(frames)
+    cv = KFold(n_splits=4)
+
+    sl = searchlight.SearchLight(mask_img, radius=1.0, cv=cv, verbose=1)
+    sl.fit(data_img, cond)
+
+    captured = capsys.readouterr().out
+    n_chunks = min(sl.n_elements_, searchlight._CHUNKS_PER_JOB)
+    assert f"Processed {n_chunks}/{n_chunks} chunks of spheres" in captured
+    assert "Job #" not in captured
+
+    sl_parallel = searchlight.SearchLight(
+        mask_img, radius=1.0, cv=cv, n_jobs=2
+    ).fit(data_img, cond)
+    np.testing.assert_array_equal(sl_parallel.scores_, sl.scores_)
@@ -14,6 +14,7 @@ import numpy as np
 import pandas as pd
 from joblib import Memory, Parallel, delayed
 from nibabel import Nifti1Image
+from numpy.linalg import matrix_rank
 from scipy.linalg import toeplitz
 from sklearn.cluster import KMeans
 from sklearn.utils.estimator_checks import check_is_fitted
@@ -45,6 +46,8 @@ from nilearn.glm.regression import (
     OLSModel,
     RegressionResults,
     SimpleRegressionResults,
+    ar_whiten,
+    ar_whiten_design,
 )
 from nilearn.image.image import check_niimg, check_same_fov, get_data
 from nilearn.interfaces.bids import get_bids_files, parse_bids_filename
@@ -110,9 +113,97 @@ def mean_scaling(Y, axis=0) -> tuple[np.ndarray, np.ndarray]:
     return Y, mean
 
 
-def _ar_model_fit(X, val, Y):
-    """Wrap fit method of ARModel to allow joblib parallelization."""
-    return ARModel(X, val).fit(Y)
+@fill_doc
+def _ar_model_fit_batched(
+    X, ar_coef_, labels, Y, minimize_memory=False, n_jobs=1, verbose=0
+):
+    """Fit one AR model per unique label in a single batch.
+
+    All the whitened designs and their pseudo-inverses
+    are computed at once with stacked-array calls,
+    the rank of the design is only computed once,
+    and Y is whitened for all voxels in a single pass,
+    instead of building one ARModel per label.
+
+    The models are then fitted on the voxels of each label
+    in a thread pool, so no data is pickled between processes.
+
+    Parameters
+    ----------
+    X : array of shape (n_time_points, n_regressors)
+        The design matrix.
+
+    ar_coef_ : array of shape (n_voxels, order)
+        AR coefficients of each voxel.
+
+    labels : array of shape (n_voxels,)
+        Label of each voxel.
+        Voxels sharing a label must share their AR coefficients.
+
+    Y : array of shape (n_time_points, n_voxels)
+        The :term:`fMRI` data.
+
+    minimize_memory : :obj:`bool`, default=False
+        If True, return
+        :class:`~nilearn.glm.regression.SimpleRegressionResults`
+        so that data and residuals are not kept in memory.
+
+    n_jobs : :obj:`int`, default=1
+        Number of threads used to fit the models of the different labels.
+
+    %(verbose0)s
+
+    Returns
+    -------
+    results : :obj:`dict`
+        Keys are the unique labels, values are the corresponding results.
+    """
+    ar_coef_ = ar_coef_.reshape(len(labels), -1)
+    unique_labels, first_voxel, label_idx = np.unique(
+        labels, return_index=True, return_inverse=True
+    )
+    rhos = ar_coef_[first_voxel]
+
+    whitened_designs = ar_whiten_design(X, rhos)
+    calc_betas = np.linalg.pinv(whitened_designs)
+    eps = np.abs(X).sum() * np.finfo(np.float64).eps
+    df_model = matrix_rank(X, eps)
+
+    wY = ar_whiten(Y, ar_coef_)
+
+    # indices of the voxels of each label
+    order = np.argsort(label_idx, kind="stable")
+    voxels_per_label = np.split(order, np.cumsum(np.bincount(label_idx))[:-1])
+
+    def _fit_label(i):
+        voxels = voxels_per_label[i]
+        model = ARModel.from_whitened_design(
+            X, rhos[i], whitened_designs[i], calc_betas[i], df_model
+        )
+        wY_label = wY[:, voxels]
+        beta = np.dot(model.calc_beta, wY_label)
+        wresid = wY_label - np.dot(model.whitened_design, beta)
+        dispersion = np.sum(wresid**2, 0) / (
+            model.whitened_design.shape[0] - model.whitened_design.shape[1]
+        )
+        result = RegressionResults(
+            beta,
+            Y[:, voxels],
+            model,
+            wY_label,
+            wresid,
+            dispersion=dispersion,
+            cov=model.normalized_cov_beta,
+        )
+        if minimize_memory:
+            result = SimpleRegressionResults(result)
+        return result
+
+    ar_result = Parallel(n_jobs=n_jobs, prefer="threads", verbose=verbose)(
+        delayed(_fit_label)(i) for i in range(len(unique_labels))
+    )
+
+    return dict(zip(unique_labels, ar_result, strict=True))
 
 
 def _yule_walker(x, order):
@@ -150,8 +241,17 @@ def _yule_walker(x, order):
 
 @fill_doc
 def run_glm(
-    Y, X, noise_model="ar1", bins=100, n_jobs=1, verbose=0, random_state=None
-) -> tuple[np.ndarray, dict[str | float, RegressionResults]]:
+    Y,
+    X,
+    noise_model="ar1",
+    bins=100,
+    n_jobs=1,
+    verbose=0,
+    random_state=None,
+    minimize_memory=False,
+) -> tuple[
+    np.ndarray, dict[str | float, RegressionResults | SimpleRegressionResults]
+]:
     """:term:`GLM` fit for an :term:`fMRI` data matrix.
 
     Parameters
@@ -186,6 +286,15 @@ def run_glm(
 
         .. nilearn_versionadded:: 0.9.1
 
+    minimize_memory : :obj:`bool`, default=False
+        If True, the results are
+        :class:`~nilearn.glm.regression.SimpleRegressionResults` instances
+        that only keep what is needed to compute contrasts,
+        so that the data and the residuals of each model
+        are released as soon as it is fitted.
+
+        .. nilearn_versionadded:: 0.14.1
+
     Returns
     -------
     labels : array of shape (n_voxels,),
@@ -193,7 +302,16 @@ def run_glm(
 
     results : :obj:`dict`,
         Keys correspond to the different labels values
-        values are RegressionResults instances corresponding to the voxels.
+        values are RegressionResults instances corresponding to the voxels
+        (SimpleRegressionResults if ``minimize_memory`` is True).
+
+    Notes
+    -----
+    For autoregressive noise models,
+    the models of all the labels are fitted in a single batch:
+    the whitened designs and their pseudo-inverses are computed
+    with stacked-array calls
+    and the fits of the different labels are run in threads.
 
     """
     check_params(locals())
@@ -234,9 +352,10 @@ def run_glm(
 
         # Either bin the AR1 coefs or cluster ARN coefs
         if ar_order == 1:
-            for idx in range(len(ar_coef_)):
-                ar_coef_[idx] = (ar_coef_[idx] * bins).astype(int) * 1.0 / bins
-            labels = np.array([str(val) for val in ar_coef_])
+            ar_coef_ = (ar_coef_ * bins).astype(int) * 1.0 / bins
+            # only convert the unique values to strings
+            unique_coefs, coef_idx = np.unique(ar_coef_, return_inverse=True)
+            labels = np.array([str(val) for val in unique_coefs])[coef_idx]
         else:  # AR(N>1) case
             n_clusters = np.min([bins, Y.shape[1]])
             kmeans = KMeans(
@@ -253,24 +372,21 @@ def run_glm(
             # Create labels and coef per voxel
             labels = np.array([cluster_labels[i] for i in kmeans.labels_])
 
-        unique_labels = np.unique(labels)
-        results = {}
-
         # Fit the AR model according to current AR(N) estimates
-        ar_result = Parallel(n_jobs=n_jobs, verbose=verbose)(
-            delayed(_ar_model_fit)(
-                X, ar_coef_[labels == val][0], Y[:, labels == val]
-            )
-            for val in unique_labels
+        results = _ar_model_fit_batched(
+            X,
+            ar_coef_,
+            labels,
+            Y,
+            minimize_memory=minimize_memory,
+            n_jobs=n_jobs,
+            verbose=verbose,
         )
 
-        # Converting the key to a string is required for AR(N>1) cases
-        results = dict(zip(unique_labels, ar_result, strict=False))
-        del unique_labels
-        del ar_result
-
     else:
         labels = np.zeros(Y.shape[1])
+        if minimize_memory:
+            ols_result = SimpleRegressionResults(ols_result)
         results = {0.0: ols_result}
 
     return labels, results
@@ -747,6 +863,7 @@ class FirstLevelModel(BaseGLM):
         t_glm = time.time()
         self._log("running")
 
+        # We save memory if inspecting model details is not necessary
         labels, results = mem_glm(
             Y,
             design.values,
@@ -754,17 +871,12 @@ class FirstLevelModel(BaseGLM):
             bins=bins,
             n_jobs=self.n_jobs,
             random_state=self.random_state,
+            minimize_memory=self.minimize_memory,
         )
 
         self._log("run_done", time_in_second=time.time() - t_glm)
 
         self.labels_.append(labels)
-
-        # We save memory if inspecting model details is not necessary
-        if self.minimize_memory:
-            results = {
-                k: SimpleRegressionResults(v) for k, v in results.items()
-            }
         self.results_.append(results)
         del Y
 
@@ -241,6 +241,50 @@ class ARModel(OLSModel):
             self.order = self.rho.shape[0]
         super().__init__(design)
 
+    @classmethod
+    def from_whitened_design(
+        cls, design, rho, whitened_design, calc_beta, df_model
+    ):
+        """Create a model from an already whitened design.
+
+        This skips the computation of the pseudo-inverse
+        and of the rank of the design done at initialization,
+        so that several models sharing the same design
+        can be created from quantities computed in a single batch.
+
+        Parameters
+        ----------
+        design : ndarray
+            2D array with design matrix.
+
+        rho : array-like
+            AR coefficients.
+
+        whitened_design : ndarray
+            ``design`` whitened with ``rho``.
+
+        calc_beta : ndarray
+            Moore-Penrose pseudoinverse of ``whitened_design``.
+
+        df_model : :obj:`int`
+            Rank of ``design``.
+
+        Returns
+        -------
+        model : ARModel
+        """
+        model = cls.__new__(cls)
+        model.rho = np.atleast_1d(np.squeeze(np.asarray(rho, np.float64)))
+        model.order = model.rho.shape[0]
+        model.design = design
+        model.whitened_design = whitened_design
+        model.calc_beta = calc_beta
+        model.normalized_cov_beta = np.dot(calc_beta, np.transpose(calc_beta))
+        model.df_total = whitened_design.shape[0]
+        model.df_model = df_model
+        model.df_residuals = model.df_total - model.df_model
+        return model
+
     def whiten(self, X):
         """Whiten a series of columns according to AR(p) covariance structure.
 
@@ -264,6 +308,58 @@ class ARModel(OLSModel):
         return whitened_X
 
 
+def ar_whiten(X, rho):
+    """Whiten columns of X, each with its own AR(p) coefficients.
+
+    This is equivalent to calling :meth:`ARModel.whiten`
+    on each column of ``X`` separately, but in a single pass.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_time_points, n_columns)
+        Array to whiten.
+
+    rho : ndarray of shape (n_columns, order)
+        AR coefficients of each column.
+
+    Returns
+    -------
+    whitened_X : ndarray of shape (n_time_points, n_columns)
+    """
+    X = np.asarray(X, np.float64)
+    rho = np.asarray(rho, np.float64).reshape(X.shape[1], -1)
+    whitened_X = X.copy()
+    for i in range(rho.shape[1]):
+        whitened_X[(i + 1) :] -= rho[:, i] * X[: -(i + 1)]
+    return whitened_X
+
+
+def ar_whiten_design(design, rhos):
+    """Whiten a design matrix for several sets of AR(p) coefficients at once.
+
+    Parameters
+    ----------
+    design : ndarray of shape (n_time_points, n_regressors)
+        Design matrix.
+
+    rhos : ndarray of shape (n_models, order)
+        AR coefficients of each model.
+
+    Returns
+    -------
+    whitened_designs : ndarray of shape \
+                       (n_models, n_time_points, n_regressors)
+    """
+    design = np.asarray(design, np.float64)
+    rhos = np.asarray(rhos, np.float64).reshape(len(rhos), -1)
+    whitened_designs = np.repeat(design[np.newaxis], len(rhos), axis=0)
+    for i in range(rhos.shape[1]):
+        whitened_designs[:, (i + 1) :] -= (
+            rhos[:, i, np.newaxis, np.newaxis] * design[: -(i + 1)]
+        )
+    return whitened_designs
+
+
 class RegressionResults(LikelihoodModelResults):
     """Summarize the fit of a linear regression model.
 
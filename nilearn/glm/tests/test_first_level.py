@@ -46,7 +46,7 @@ from nilearn.glm.first_level.first_level import (
     _list_valid_subjects,
     _yule_walker,
 )
-from nilearn.glm.regression import ARModel, OLSModel
+from nilearn.glm.regression import ARModel, OLSModel, SimpleRegressionResults
 from nilearn.glm.thresholding import DEFAULT_Z_THRESHOLD
 from nilearn.image import get_data, iter_img, new_img_like
 from nilearn.maskers import NiftiMasker, SurfaceMasker
@@ -539,6 +539,40 @@ def test_run_glm_ar1(rng):
     assert isinstance(results[labels[0]].model, ARModel)
 
 
+def test_run_glm_ar1_matches_ar_model(rng):
+    """Check batched AR fit gives the same results as one ARModel per bin."""
+    n, p, q = 50, 80, 10
+    X, Y = rng.standard_normal(size=(p, q)), rng.standard_normal(size=(p, n))
+
+    labels, results = run_glm(Y, X, "ar1", bins=10)
+
+    for label, result in results.items():
+        expected = ARModel(X, float(label)).fit(Y[:, labels == label])
+        assert_almost_equal(result.theta, expected.theta)
+        assert_almost_equal(result.cov, expected.cov)
+        assert_almost_equal(result.dispersion, expected.dispersion)
+        assert_almost_equal(result.residuals, expected.residuals)
+
+
+@pytest.mark.parametrize("noise_model", ["ols", "ar1", "ar2"])
+def test_run_glm_minimize_memory(rng, noise_model):
+    """Check minimize_memory returns SimpleRegressionResults."""
+    n, p, q = 33, 80, 10
+    X, Y = rng.standard_normal(size=(p, q)), rng.standard_normal(size=(p, n))
+
+    labels, results = run_glm(Y, X, noise_model, random_state=0)
+    labels_simple, results_simple = run_glm(
+        Y, X, noise_model, random_state=0, minimize_memory=True
+    )
+
+    assert_array_equal(labels, labels_simple)
+    assert results.keys() == results_simple.keys()
+    for label, result in results_simple.items():
+        assert isinstance(result, SimpleRegressionResults)
+        assert_array_equal(result.theta, results[label].theta)
+        assert_array_equal(result.dispersion, results[label].dispersion)
+
+
 @pytest.mark.flaky(reruns=5, reruns_delay=2, condition=is_windows_platform())
 def test_run_glm_ar3(rng):
     """Test run_glm with AR(3) noise model."""
@@ -9,6 +9,7 @@ from numpy.testing import (
 )
 
 from nilearn.glm import ARModel, OLSModel, SimpleRegressionResults
+from nilearn.glm.regression import ar_whiten, ar_whiten_design
 
 
 @pytest.fixture()
@@ -102,3 +103,36 @@ def test_simple_results(X, Y):
     assert_array_equal(
         results.normalized_residuals, simple_results.normalized_residuals(Y, X)
     )
+
+
+def test_ar_whiten(rng, Y):
+    """Check that per-column whitening matches ARModel.whiten."""
+    rho = rng.uniform(-0.5, 0.5, size=(Y.shape[1], 2))
+
+    whitened_Y = ar_whiten(Y, rho)
+
+    for i in range(Y.shape[1]):
+        assert_array_almost_equal(
+            whitened_Y[:, i], ARModel(Y, rho[i]).whiten(Y[:, i])
+        )
+
+
+def test_ar_whiten_design_and_from_whitened_design(X, Y):
+    """Check that models built from batched quantities match ARModel."""
+    rhos = np.array([[-0.3], [0.1], [0.6]])
+
+    whitened_designs = ar_whiten_design(X, rhos)
+    calc_betas = np.linalg.pinv(whitened_designs)
+
+    for rho, whitened_design, calc_beta in zip(
+        rhos, whitened_designs, calc_betas, strict=True
+    ):
+        expected = ARModel(X, rho).fit(Y)
+        results = ARModel.from_whitened_design(
+            X, rho, whitened_design, calc_beta, 10
+        ).fit(Y)
+
+        assert results.df_residuals == expected.df_residuals
+        assert_array_almost_equal(results.theta, expected.theta)
+        assert_array_almost_equal(results.cov, expected.cov)
+        assert_array_almost_equal(results.dispersion, expected.dispersion)
@@ -149,6 +149,12 @@ class MultiNiftiMasker(_MultiMixin, NiftiMasker):
 
     %(clean_args)s
 
+    %(chunk_size)s
+        Chunked reading is not possible
+        when the images have to be resampled.
+
+        .. nilearn_versionadded:: 0.14.1
+
     Attributes
     ----------
     affine_ : 4x4 :obj:`numpy.ndarray`
@@ -203,6 +209,7 @@ class MultiNiftiMasker(_MultiMixin, NiftiMasker):
         reports=True,
         cmap="gray",
         clean_args=None,
+        chunk_size=None,
     ):
         super().__init__(
             # Mask is provided or computed
@@ -227,6 +234,7 @@ class MultiNiftiMasker(_MultiMixin, NiftiMasker):
             reports=reports,
             cmap=cmap,
             clean_args=clean_args,
+            chunk_size=chunk_size,
         )
         self.n_jobs = n_jobs
 
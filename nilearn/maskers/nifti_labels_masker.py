@@ -47,15 +47,26 @@ class _ExtractionFunctor:
         strategy,
         keep_masked_labels,
         mask_img,
+        labels_operator=None,
     ):
         self.labels_img = labels_img
         self.background_label = background_label
         self.strategy = strategy
         self.keep_masked_labels = keep_masked_labels
         self.mask_img = mask_img
+        self.labels_operator = labels_operator
 
     def __call__(self, imgs):
-        from nilearn.regions.signal_extraction import img_to_signals_labels
+        from nilearn.regions.signal_extraction import (
+            _img_to_signals_labels_operator,
+            img_to_signals_labels,
+        )
+
+        if self.labels_operator is not None:
+            signals, labels, masked_labels_img = (
+                _img_to_signals_labels_operator(imgs, self.labels_operator)
+            )
+            return signals, (labels, masked_labels_img)
 
         signals, labels, masked_labels_img = img_to_signals_labels(
             imgs,
@@ -482,6 +493,8 @@ class NiftiLabelsMasker(_LabelMaskerMixin, BaseMasker):
         return display
 
     def _fit(self, imgs):
+        from nilearn.regions.signal_extraction import _get_labels_operator
+
         check_reduction_strategy(self.strategy)
         check_parameter_in_allowed(
             self.resampling_target,
@@ -571,6 +584,20 @@ class NiftiLabelsMasker(_LabelMaskerMixin, BaseMasker):
                     "No label left after applying mask to the labels image."
                 )
 
+        # The operator extracting the signals is reused across images
+        # that do not require resampling the labels or the mask.
+        self._labels_operator = None
+        if not self.keep_masked_labels and (
+            self.mask_img_ is None
+            or check_same_fov(self.labels_img_, self.mask_img_)
+        ):
+            self._labels_operator = _get_labels_operator(
+                self.labels_img_,
+                self.mask_img_,
+                self.background_label,
+                self.strategy,
+            )
+
         self._report_content["reports_at_fit_time"] = self.reports
         if self.reports:
             self._reporting_data = {
@@ -764,6 +791,10 @@ class NiftiLabelsMasker(_LabelMaskerMixin, BaseMasker):
 
         sklearn_output_config = getattr(self, "_sklearn_output_config", None)
 
+        labels_operator = None
+        if labels_img_ is self.labels_img_ and mask_img_ is self.mask_img_:
+            labels_operator = getattr(self, "_labels_operator", None)
+
         region_signals, (ids, masked_atlas) = self._cache(
             filter_and_extract,
             ignore=["verbose", "memory", "memory_level"],
@@ -776,6 +807,7 @@ class NiftiLabelsMasker(_LabelMaskerMixin, BaseMasker):
                 self.strategy,
                 self.keep_masked_labels,
                 mask_img_,
+                labels_operator,
             ),
             # Pre-processing
             params,
@@ -37,14 +37,18 @@ from nilearn.masking import (
 class _ExtractionFunctor:
     func_name = "nifti_masker_extractor"
 
-    def __init__(self, mask_img_):
+    def __init__(self, mask_img_, smoothing_fwhm=None, chunk_size=None):
         self.mask_img_ = mask_img_
+        self.smoothing_fwhm = smoothing_fwhm
+        self.chunk_size = chunk_size
 
     def __call__(self, imgs):
         return (
             apply_mask(
                 imgs,
                 self.mask_img_,
+                smoothing_fwhm=self.smoothing_fwhm,
+                chunk_size=self.chunk_size,
             ),
             imgs.affine,
         )
@@ -177,9 +181,21 @@ def filter_and_mask(
         parameters["target_shape"] = mask_img_.shape
         parameters["target_affine"] = mask_img_.affine
 
+    # When reading the images by chunks,
+    # smoothing is done chunk by chunk during the extraction
+    # so that the full 4D image is never loaded in memory.
+    chunk_size = parameters.get("chunk_size")
+    smoothing_fwhm = None
+    if chunk_size is not None:
+        parameters = copy_object(parameters)
+        smoothing_fwhm = parameters["smoothing_fwhm"]
+        parameters["smoothing_fwhm"] = None
+
     data, _ = filter_and_extract(
         imgs,
-        _ExtractionFunctor(mask_img_),
+        _ExtractionFunctor(
+            mask_img_, smoothing_fwhm=smoothing_fwhm, chunk_size=chunk_size
+        ),
         parameters,
         memory_level=memory_level,
         memory=memory,
@@ -294,6 +310,11 @@ class NiftiMasker(ClassNamePrefixFeaturesOutMixin, BaseMasker):
 
         .. nilearn_versionadded:: 0.12.0
 
+    %(chunk_size)s
+        Chunked reading is not possible
+        when the images have to be resampled.
+
+        .. nilearn_versionadded:: 0.14.1
 
     Attributes
     ----------
@@ -354,6 +375,7 @@ class NiftiMasker(ClassNamePrefixFeaturesOutMixin, BaseMasker):
         reports=True,
         cmap="gray",
         clean_args=None,
+        chunk_size=None,
     ):
         # Mask is provided or computed
         self.mask_img = mask_img
@@ -377,6 +399,7 @@ class NiftiMasker(ClassNamePrefixFeaturesOutMixin, BaseMasker):
         self.reports = reports
         self.cmap = cmap
         self.clean_args = clean_args
+        self.chunk_size = chunk_size
 
         self._reset_report()
 
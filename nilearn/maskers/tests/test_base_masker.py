@@ -53,6 +53,7 @@ def test_get_masker_params():
     """Test for private method to return params of an instance as dict."""
     masker = NiftiMasker()
     assert masker._get_masker_params() == {
+        "chunk_size": None,
         "clean_args": None,
         "cmap": "gray",
         "detrend": False,
@@ -74,6 +75,7 @@ def test_get_masker_params():
     }
 
     assert masker._get_masker_params(ignore=["t_r"]) == {
+        "chunk_size": None,
         "clean_args": None,
         "cmap": "gray",
         "detrend": False,
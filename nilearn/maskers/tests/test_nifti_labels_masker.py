@@ -642,6 +642,78 @@ def test_nifti_labels_masker_with_mask(
     assert np.allclose(get_data(masker.region_atlas_), masked_labels_data)
 
 
+@pytest.mark.parametrize("strategy", ["mean", "sum"])
+def test_nifti_labels_masker_labels_operator(
+    monkeypatch, affine_eye, shape_3d_default, n_regions, length, strategy
+):
+    """Test that the labels operator computed at fit is reused."""
+    from nilearn.regions import signal_extraction
+
+    fmri_img, mask_img = generate_random_img(
+        (*shape_3d_default, length), affine=affine_eye
+    )
+    labels_img = generate_labeled_regions(
+        shape_3d_default, n_regions, affine=affine_eye
+    )
+
+    masker = NiftiLabelsMasker(
+        labels_img, mask_img=mask_img, strategy=strategy, standardize=None
+    ).fit()
+
+    assert masker._labels_operator is not None
+
+    n_uses = {"count": 0}
+    operator_extraction = signal_extraction._img_to_signals_labels_operator
+
+    def counting_extraction(*args, **kwargs):
+        n_uses["count"] += 1
+        return operator_extraction(*args, **kwargs)
+
+    monkeypatch.setattr(
+        signal_extraction,
+        "_img_to_signals_labels_operator",
+        counting_extraction,
+    )
+
+    signals = masker.transform(fmri_img)
+
+    assert n_uses["count"] == 1
+
+    masker._labels_operator = None
+
+    assert_almost_equal(masker.transform(fmri_img), signals)
+    assert n_uses["count"] == 1
+
+    # labels resampled to the data at transform do not use the operator
+    affine2 = 2 * affine_eye
+    affine2[-1, -1] = 1
+    fmri_img2, _ = generate_random_img((5, 5, 6, length), affine=affine2)
+    masker = NiftiLabelsMasker(
+        labels_img, resampling_target="data", standardize=None
+    ).fit()
+    masker.transform(fmri_img2)
+
+    assert masker._labels_operator is not None
+    assert n_uses["count"] == 1
+
+
+def test_nifti_labels_masker_labels_operator_not_used(
+    affine_eye, shape_3d_default, n_regions
+):
+    """Test that no labels operator is computed when it cannot be reused."""
+    labels_img = generate_labeled_regions(
+        shape_3d_default, n_regions, affine=affine_eye
+    )
+
+    masker = NiftiLabelsMasker(labels_img, strategy="median").fit()
+
+    assert masker._labels_operator is None
+
+    masker = NiftiLabelsMasker(labels_img, keep_masked_labels=True).fit()
+
+    assert masker._labels_operator is None
+
+
 def generate_labels(n_regions: int, background: str = ""):
     """Create list of strings to use as labels."""
     labels = []
@@ -451,3 +451,29 @@ def test_filter_and_mask(affine_eye):
     # Test return_affine = False
     data = filter_and_mask(data_img, mask_img, params)
     assert data.shape == (data_shape[3], np.prod(np.array(mask.shape)))
+
+
+@pytest.mark.parametrize("smoothing_fwhm", [None, 4])
+def test_chunk_size(tmp_path, rng, affine_eye, smoothing_fwhm):
+    """Check that chunked reading gives the same signals."""
+    data = rng.standard_normal((10, 11, 12, 9))
+    data_img = Nifti1Image(data, affine_eye)
+    data_img.to_filename(tmp_path / "data.nii")
+    mask = np.zeros((10, 11, 12), dtype="int8")
+    mask[2:8, 3:9, 4:10] = 1
+    mask_img = Nifti1Image(mask, affine_eye)
+
+    masker = NiftiMasker(
+        mask_img, smoothing_fwhm=smoothing_fwhm, standardize="zscore_sample"
+    )
+    expected = masker.fit_transform(tmp_path / "data.nii")
+
+    masker_chunked = NiftiMasker(
+        mask_img,
+        smoothing_fwhm=smoothing_fwhm,
+        standardize="zscore_sample",
+        chunk_size=4,
+    )
+    signals = masker_chunked.fit_transform(tmp_path / "data.nii")
+
+    assert_array_equal(signals, expected)
@@ -934,7 +934,12 @@ def compute_multi_brain_mask(
 
 @fill_doc
 def apply_mask(
-    imgs, mask_img, dtype="f", smoothing_fwhm=None, ensure_finite=True
+    imgs,
+    mask_img,
+    dtype="f",
+    smoothing_fwhm=None,
+    ensure_finite=True,
+    chunk_size=None,
 ) -> np.ndarray:
     """Extract signals from images using specified mask.
 
@@ -966,6 +971,11 @@ def apply_mask(
         If ensure_finite is True, the non-finite values (NaNs and
         infs) found in the images will be replaced by zeros.
 
+    %(chunk_size)s
+        Ignored for surface data.
+
+        .. nilearn_versionadded:: 0.14.1
+
     Returns
     -------
     run_series : :class:`numpy.ndarray`
@@ -991,11 +1001,18 @@ def apply_mask(
         dtype=dtype,
         smoothing_fwhm=smoothing_fwhm,
         ensure_finite=ensure_finite,
+        chunk_size=chunk_size,
     )
 
 
 def apply_mask_fmri(
-    imgs, mask_img, dtype="f", smoothing_fwhm=None, ensure_finite=True
+    imgs,
+    mask_img,
+    dtype="f",
+    smoothing_fwhm=None,
+    ensure_finite=True,
+    chunk_size=None,
+    output=None,
 ) -> np.ndarray:
     """Perform similar action to :func:`nilearn.masking.apply_mask`.
 
@@ -1003,6 +1020,14 @@ def apply_mask_fmri(
     some costly checks on ``mask_img`` are not performed: ``mask_img`` is
     assumed to contain only two different values (this is checked for in
     :func:`nilearn.masking.apply_mask`, not in this function).
+
+    When ``chunk_size`` is not None, the 4D volume data are read
+    ``chunk_size`` volumes at a time
+    and the masked signals are written in ``output``
+    if it is provided
+    (for example a :class:`numpy.memmap`
+    of shape (n_timepoints, n_voxels)),
+    or in an array allocated on the first chunk otherwise.
     """
     if isinstance(imgs, SurfaceImage) and isinstance(mask_img, SurfaceImage):
         check_polymesh_equal(mask_img.mesh, imgs.mesh)
@@ -1042,6 +1067,17 @@ def apply_mask_fmri(
             f"{imgs_img.shape[:3]!s}"
         )
 
+    if chunk_size is not None and len(imgs_img.shape) == 4:
+        return _apply_mask_fmri_chunked(
+            imgs_img,
+            mask_data,
+            dtype=dtype,
+            smoothing_fwhm=smoothing_fwhm,
+            ensure_finite=ensure_finite,
+            chunk_size=chunk_size,
+            output=output,
+        )
+
     # All the following has been optimized for C order.
     # Time that may be lost in conversion here is regained multiple times
     # afterward, especially if smoothing is applied.
@@ -1066,6 +1102,102 @@ def apply_mask_fmri(
     return series[mask_data].T
 
 
+def _apply_mask_fmri_chunked(
+    imgs_img,
+    mask_data,
+    dtype="f",
+    smoothing_fwhm=None,
+    ensure_finite=True,
+    chunk_size=100,
+    output=None,
+):
+    """Mask a 4D image by reading it ``chunk_size`` volumes at a time.
+
+    Smoothing only operates along the three spatial dimensions,
+    so each chunk can be smoothed and masked independently
+    and the peak memory is bounded
+    by the size of one chunk plus the size of the output.
+
+    Parameters
+    ----------
+    imgs_img : 4D :class:`nibabel.nifti1.Nifti1Image`
+        Image to mask.
+        Its data are not loaded in memory if they are not already.
+
+    mask_data : 3D :class:`numpy.ndarray` of bool
+        Mask with the same shape as the first three dimensions of imgs_img.
+
+    chunk_size : :obj:`int`
+        Number of volumes to read at once.
+
+    output : :class:`numpy.ndarray` or None, default=None
+        Array of shape (n_timepoints, n_voxels) to write the signals in.
+        If None, an array is allocated.
+
+    For the other parameters, see :func:`nilearn.masking.apply_mask_fmri`.
+
+    Returns
+    -------
+    output : :class:`numpy.ndarray`
+        2D array of shape (n_timepoints, n_voxels).
+    """
+    # Delayed import to avoid circular imports
+    from nilearn.image.image import smooth_array
+
+    if not isinstance(chunk_size, numbers.Integral) or chunk_size < 1:
+        raise ValueError(
+            f"'chunk_size' must be a strictly positive integer or None. "
+            f"Got: {chunk_size!r}"
+        )
+
+    n_timepoints = imgs_img.shape[3]
+    n_voxels = int(mask_data.sum())
+
+    if output is not None and output.shape != (n_timepoints, n_voxels):
+        raise ValueError(
+            f"'output' must have shape {(n_timepoints, n_voxels)}. "
+            f"Got: {output.shape}"
+        )
+
+    # Use the cached data if already loaded,
+    # otherwise slice the array proxy so that only the requested
+    # volumes are read from disk.
+    dataobj = imgs_img.dataobj
+    if imgs_img.in_memory:
+        dataobj = safe_get_data(imgs_img)
+
+    affine = imgs_img.affine[:3, :3]
+
+    for start in range(0, n_timepoints, chunk_size):
+        stop = min(start + chunk_size, n_timepoints)
+        chunk = np.asanyarray(dataobj[..., start:stop])
+
+        if dtype == "f":
+            dtype = chunk.dtype if chunk.dtype.kind == "f" else np.float32
+
+        # copy as smoothing is done inplace
+        # and chunk may be a view on the image data
+        chunk = as_ndarray(chunk, dtype=dtype, order="C", copy=True)
+
+        smooth_array(
+            chunk,
+            affine,
+            fwhm=smoothing_fwhm,
+            ensure_finite=ensure_finite,
+            copy=False,
+        )
+
+        if output is None:
+            output = np.empty((n_timepoints, n_voxels), dtype=chunk.dtype)
+        output[start:stop] = chunk[mask_data].T
+        del chunk
+
+    if output is None:
+        output = np.empty((n_timepoints, n_voxels), dtype=np.float32)
+
+    return output
+
+
 def _unmask_3d(X, mask, order="C"):
     """Take masked data and bring them back to 3D (space only).
 
@@ -69,72 +69,283 @@ def calculate_tfce(
     """
     tfce_4d = np.zeros_like(arr4d)
 
+    # Background voxels never belong to a cluster
+    mask = np.any(arr4d != 0, axis=3)
+    neighbor_graph = get_neighbor_graph(mask, bin_struct)
+
     # For each passed t map
     for i_regressor in range(arr4d.shape[3]):
         arr3d = arr4d[..., i_regressor]
-
-        signs = [-1, 1] if two_sided_test else [1]
         score_threshs = _return_score_threshs(arr3d, dh, two_sided_test)
-
-        # If we apply the sign first...
-        for sign in signs:
-            # Init a temp copy of arr3d with the current sign applied,
-            # which can then be reused by incrementally setting more
-            # voxel's to background, by taking advantage that each score_thresh
-            # is incrementally larger
-            temp_arr3d = arr3d * sign
-
-            # Prep step
-            for score_thresh in score_threshs:
-                temp_arr3d[temp_arr3d < score_thresh] = 0
-
-                # Label into clusters - importantly (for the next step)
-                # this returns clusters labeled ordinally
-                # from 1 to n_clusters+1,
-                # which allows us to use bincount to count
-                # frequencies directly.
-                labeled_arr3d, _ = label(temp_arr3d, bin_struct)
-
-                # Next, we want to replace each label with its cluster
-                # extent, that is, the size of the cluster it is part of
-                # To do this, we will first compute a flattened version of
-                # only the non-zero cluster labels.
-                labeled_arr3d_flat = labeled_arr3d.flatten()
-                non_zero_inds = np.where(labeled_arr3d_flat != 0)[0]
-                labeled_non_zero = labeled_arr3d_flat[non_zero_inds]
-
-                # Count the size of each unique cluster, via its label.
-                # The reason why we pass only the non-zero labels to bincount
-                # is because it includes a bin for zeros, and in our labels
-                # zero represents the background,
-                # which we want to have a TFCE value of 0.
-                cluster_counts = np.bincount(labeled_non_zero)
-
-                # Next, we convert each unique cluster count to its TFCE value.
-                # Where each cluster's tfce value is based
-                # on both its cluster extent and z-value
-                # (via the current score_thresh)
-                # NOTE: We do not multiply by dh, based on fslmaths'
-                # implementation. This differs from the original paper.
-                cluster_tfces = sign * (cluster_counts**E) * (score_thresh**H)
-
-                # Before we can add these values to tfce_4d, we need to
-                # map cluster-wise tfce values back to a voxel-wise array,
-                # including any zero / background voxels.
-                tfce_step_values = np.zeros(labeled_arr3d_flat.shape)
-                tfce_step_values[non_zero_inds] = cluster_tfces[
-                    labeled_non_zero
-                ]
-
-                # Now, we just need to reshape these values back to 3D
-                # and they can be incremented to tfce_4d.
-                tfce_4d[..., i_regressor] += tfce_step_values.reshape(
-                    temp_arr3d.shape
-                )
+        tfce_4d[mask, i_regressor] = _calculate_tfce_one_map(
+            arr3d[mask], neighbor_graph, score_threshs, E, H, two_sided_test
+        )
 
     return tfce_4d
 
 
+def get_neighbor_graph(mask, bin_struct):
+    """Return the pairs of neighboring voxels of a mask.
+
+    Parameters
+    ----------
+    mask : :obj:`numpy.ndarray` of shape (X, Y, Z)
+        Boolean mask of the voxels.
+    bin_struct : :obj:`numpy.ndarray` of shape (3, 3, 3)
+        Connectivity matrix for defining clusters.
+
+    Returns
+    -------
+    neighbor_graph : :obj:`numpy.ndarray` of shape (2, n_edges)
+        Indices, in the masked voxels (``arr3d[mask]``),
+        of the pairs of neighboring voxels.
+        Each pair appears only once.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    indices = np.full(mask.shape, -1, dtype=np.intp)
+    indices[mask] = np.arange(np.count_nonzero(mask))
+
+    center = np.array(bin_struct.shape) // 2
+    edges = []
+    for offset in np.argwhere(bin_struct) - center:
+        # only keep one of the two opposite offsets
+        if tuple(offset) <= (0,) * len(offset):
+            continue
+        source = tuple(
+            slice(max(0, -o), n - max(0, o))
+            for o, n in zip(offset, mask.shape, strict=True)
+        )
+        target = tuple(
+            slice(max(0, o), n - max(0, -o))
+            for o, n in zip(offset, mask.shape, strict=True)
+        )
+        pairs = np.stack([indices[source].ravel(), indices[target].ravel()])
+        edges.append(pairs[:, np.all(pairs >= 0, axis=0)])
+
+    if not edges:
+        return np.empty((2, 0), dtype=np.intp)
+    return np.hstack(edges)
+
+
+def calculate_tfce_on_graph(
+    scores,
+    neighbor_graph,
+    E=0.5,
+    H=2,
+    dh="auto",
+    two_sided_test: bool = True,
+):
+    """Calculate threshold-free cluster enhancement values of masked maps.
+
+    Equivalent to :func:`calculate_tfce` on masked voxels,
+    with the connectivity of the voxels given as a graph.
+    Thresholds are swept from high to low,
+    and clusters are only updated with the voxels and edges
+    added at each threshold, instead of being labeled from scratch.
+
+    Parameters
+    ----------
+    scores : :obj:`numpy.ndarray` of shape (n_voxels, n_regressors)
+        Unthresholded t-statistic maps of the masked voxels.
+    neighbor_graph : :obj:`numpy.ndarray` of shape (2, n_edges)
+        Pairs of neighboring voxels,
+        as returned by :func:`get_neighbor_graph`.
+    E : :obj:`float`, default=0.5
+        Extent weight.
+    H : :obj:`float`, default=2
+        Height weight.
+    dh : 'auto' or :obj:`float`, default='auto'
+        Step size for TFCE calculation.
+        If set to 'auto', use 100 steps, as is done in fslmaths.
+    two_sided_test : :obj:`bool`, default=True
+        Whether to assess both positive and negative clusters (True) or just
+        positive ones (False).
+
+    Returns
+    -------
+    tfce_arr : :obj:`numpy.ndarray`, shape=(n_voxels, n_regressors)
+        :term:`TFCE` values.
+    """
+    tfce_arr = np.zeros_like(scores, dtype=float)
+    for i_regressor in range(scores.shape[1]):
+        arr = scores[:, i_regressor]
+        # the background of the full volume is part of the thresholds range
+        score_threshs = _return_score_threshs(
+            np.append(arr, 0), dh, two_sided_test
+        )
+        tfce_arr[:, i_regressor] = _calculate_tfce_one_map(
+            arr, neighbor_graph, score_threshs, E, H, two_sided_test
+        )
+    return tfce_arr
+
+
+def _calculate_tfce_one_map(
+    arr, neighbor_graph, score_threshs, E, H, two_sided_test
+):
+    """Calculate the TFCE values of a single masked map."""
+    tfce_arr = np.zeros(arr.shape)
+    signs = [-1, 1] if two_sided_test else [1]
+    for sign in signs:
+        tfce_arr += sign * _sweep_thresholds(
+            arr * sign, neighbor_graph, score_threshs, E, H
+        )
+    return tfce_arr
+
+
+def _sweep_thresholds(arr, neighbor_graph, score_threshs, E, H):
+    """Sum the TFCE values of all the thresholds, from high to low.
+
+    Clusters are maintained with a union-find structure
+    while thresholds are swept from high to low:
+    at each threshold, only the edges between voxels
+    that are above this threshold, but not above the previous one,
+    are added.
+
+    Each time clusters merge, a new node is added to a tree of clusters,
+    as the parent of the merged clusters.
+    A cluster of constant extent contributes the same value
+    to all its voxels at each threshold it exists for.
+    The TFCE value of a voxel is the sum of the contributions
+    of the clusters it belonged to, that is of its ancestors in the tree.
+    """
+    n_voxels = arr.shape[0]
+    n_steps = len(score_threshs)
+
+    # number of thresholds each voxel (and each edge) is above
+    voxel_levels = np.searchsorted(
+        score_threshs, np.where(np.isnan(arr), -np.inf, arr), side="right"
+    )
+    # voxels with a score of 0 never belong to a cluster
+    voxel_levels[arr == 0] = 0
+    edge_levels = np.minimum(
+        voxel_levels[neighbor_graph[0]], voxel_levels[neighbor_graph[1]]
+    )
+    # edges between voxels below all thresholds are never used
+    is_active = edge_levels > 0
+    edge_levels = edge_levels[is_active]
+    # small integers are sorted with a (fast) radix sort
+    edge_order = np.argsort(
+        (n_steps - edge_levels).astype(np.int16), kind="stable"
+    )
+    edges = neighbor_graph[:, is_active][:, edge_order]
+    n_active_edges = np.cumsum(
+        np.bincount(edge_levels, minlength=n_steps + 1)[::-1]
+    )[::-1]
+
+    # Nodes 0 to n_voxels - 1 are the voxels,
+    # and there are at most n_voxels - 1 merges.
+    n_nodes = 2 * n_voxels
+    parent = np.arange(n_nodes)  # tree of clusters
+    root = np.arange(n_nodes)  # compressed paths to the current clusters
+    size = np.ones(n_nodes)
+    # a node exists for the steps first_step, first_step - 1, ..., last_step
+    first_step = np.zeros(n_nodes, dtype=np.intp)
+    first_step[:n_voxels] = voxel_levels
+    last_step = np.ones(n_nodes, dtype=np.intp)
+    n_used_nodes = n_voxels
+
+    n_edges = 0
+    for i_step in range(n_steps, 0, -1):
+        new_edges = edges[:, n_edges : n_active_edges[i_step]]
+        n_edges = n_active_edges[i_step]
+        if new_edges.shape[1] == 0:
+            continue
+
+        new_edges = _find_roots(root, new_edges)
+        new_edges = new_edges[:, new_edges[0] != new_edges[1]]
+        if new_edges.shape[1] == 0:
+            continue
+
+        # group the clusters joined by the new edges
+        clusters, inverse = np.unique(new_edges, return_inverse=True)
+        n_merged, components = _connected_components(
+            inverse.reshape(new_edges.shape), len(clusters)
+        )
+
+        # add a parent node to each group of clusters
+        merged = slice(n_used_nodes, n_used_nodes + n_merged)
+        parent[clusters] = n_used_nodes + components
+        root[clusters] = n_used_nodes + components
+        last_step[clusters] = i_step + 1
+        first_step[merged] = i_step
+        size[merged] = np.bincount(
+            components, weights=size[clusters], minlength=n_merged
+        )
+        n_used_nodes += n_merged
+
+    # Contribution of each node to the TFCE value of each of its voxels.
+    # NOTE: We do not multiply by dh, based on fslmaths'
+    # implementation. This differs from the original paper.
+    # Extended precision keeps the differences of cumulative sums
+    # as accurate as summing the heights one threshold at a time.
+    cumulative_heights = np.concatenate(
+        ([0.0], np.cumsum(score_threshs.astype(np.longdouble) ** H))
+    )
+    nodes = slice(0, n_used_nodes)
+    heights = np.where(
+        first_step[nodes] >= last_step[nodes],
+        cumulative_heights[first_step[nodes]]
+        - cumulative_heights[last_step[nodes] - 1],
+        0.0,
+    )
+    # an extra node with no contribution is the parent of all roots
+    contributions = np.append((size[nodes] ** E) * heights, 0.0)
+    ancestors = np.append(parent[nodes], n_used_nodes)
+    ancestors[ancestors == np.arange(n_used_nodes + 1)] = n_used_nodes
+
+    # sum the contributions of all the ancestors with pointer jumping
+    while np.any(ancestors[:n_voxels] != n_used_nodes):
+        contributions = contributions + contributions[ancestors]
+        ancestors = ancestors[ancestors]
+    return contributions[:n_voxels].astype(np.float64)
+
+
+def _find_roots(root, nodes):
+    """Return the current clusters of nodes, compressing paths in place."""
+    roots = root[nodes].ravel()
+    todo = np.arange(roots.size)
+    while todo.size > 0:
+        parents = root[roots[todo]]
+        not_root = parents != roots[todo]
+        roots[todo] = parents
+        todo = todo[not_root]
+    roots = roots.reshape(nodes.shape)
+    root[nodes] = roots
+    return roots
+
+
+def _connected_components(edges, n_nodes):
+    """Label the connected components of a graph.
+
+    Each node is hooked to the smallest node it is connected to,
+    with pointer jumping to keep trees flat.
+
+    Returns
+    -------
+    n_components : :obj:`int`
+        Number of connected components.
+    components : :obj:`numpy.ndarray` of shape (n_nodes,)
+        Component of each node, from 0 to ``n_components - 1``.
+    """
+    labels = np.arange(n_nodes)
+    while True:
+        source, target = labels[edges]
+        if np.array_equal(source, target):
+            break
+        np.minimum.at(
+            labels,
+            np.maximum(source, target),
+            np.minimum(source, target),
+        )
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    representatives, components = np.unique(labels, return_inverse=True)
+    return len(representatives), components
+
+
 def _return_score_threshs(arr3d, dh, two_sided_test):
     """Compute list of score threshold to use for TFCE."""
     max_score = (
@@ -439,3 +650,53 @@ def t_score_with_covars_and_normalized_design(
         a2 = np.sum(beta_targetvars_covars**2, 1)
         rss = 1 - a2[:, np.newaxis] - beta_targetvars_testedvars**2
     return beta_targetvars_testedvars * np.sqrt((dof - 1.0) / rss)
+
+
+def t_score_with_permuted_designs(
+    permuted_designs, target_vars, n_tested_vars
+):
+    """t-scores of a batch of permuted designs against target variates.
+
+    All the permuted designs are regressed against the target variates
+    with a single matrix product.
+    This is equivalent to calling
+    :func:`t_score_with_covars_and_normalized_design`
+    on each permuted design, under the same assumptions.
+
+    Parameters
+    ----------
+    permuted_designs : array-like, \
+            shape=(n_perm, n_samples, n_tested_vars + n_covars)
+        Permuted tested variates, followed by the permuted
+        orthonormalized covariates.
+
+    target_vars : array-like, shape=(n_samples, n_target_vars)
+        Targets variates. F-ordered is better for efficient computation.
+
+    n_tested_vars : :obj:`int`
+        Number of tested variates in each permuted design.
+
+    Returns
+    -------
+    score : numpy.ndarray, shape=(n_perm, n_target_vars, n_tested_vars)
+        t-scores associated with each permuted design.
+
+    """
+    n_perm, n_samples, n_columns = permuted_designs.shape
+    # Tested variates are fitted independently,
+    # so lost_dof is unrelated to n_tested_vars.
+    dof = n_samples - (n_columns - n_tested_vars)
+
+    # stack all the permuted designs to compute all betas in one product
+    stacked_designs = np.transpose(permuted_designs, (1, 0, 2)).reshape(
+        n_samples, n_perm * n_columns
+    )
+    betas = np.dot(target_vars.T, stacked_designs).reshape(
+        -1, n_perm, n_columns
+    )
+    betas = np.transpose(betas, (1, 0, 2))
+
+    beta_targetvars_testedvars = betas[..., :n_tested_vars]
+    a2 = np.sum(betas[..., n_tested_vars:] ** 2, axis=2)
+    rss = 1 - a2[..., np.newaxis] - beta_targetvars_testedvars**2
+    return beta_targetvars_testedvars * np.sqrt((dof - 1.0) / rss)
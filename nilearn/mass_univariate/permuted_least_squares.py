@@ -7,7 +7,6 @@ import warnings
 
 import joblib
 import numpy as np
-from nibabel import Nifti1Image
 from scipy import stats
 from scipy.ndimage import generate_binary_structure, label
 from sklearn.utils import check_random_state
@@ -17,16 +16,25 @@ from nilearn._utils import logger
 from nilearn._utils.docs import fill_doc
 from nilearn._utils.logger import find_stack_level, readable_time
 from nilearn._utils.param_validation import check_params
-from nilearn.masking import apply_mask
+from nilearn.masking import apply_mask, load_mask_img
 from nilearn.mass_univariate._utils import (
     calculate_cluster_measures,
-    calculate_tfce,
+    calculate_tfce_on_graph,
+    get_neighbor_graph,
     normalize_matrix_on_axis,
     null_to_p,
     orthonormalize_matrix,
     t_score_with_covars_and_normalized_design,
+    t_score_with_permuted_designs,
 )
 
+# Maximum number of permutations regressed in a single matrix product
+_PERM_BATCH_MAX_SIZE = 64
+# Maximum size in bytes of the t-scores of a batch of permutations
+_PERM_BATCH_MAX_BYTES = 2**27
+# Minimum number of batches of permutations to share between workers
+_PERM_BATCH_MIN_BATCHES = 32
+
 
 def _permuted_ols_on_chunk(
     scores_original_data,
@@ -37,18 +45,24 @@ def _permuted_ols_on_chunk(
     confounding_vars=None,
     masker=None,
     n_perm=10000,
-    n_perm_chunk=10000,
+    perm_batch_sizes=(10000,),
     intercept_test=True,
     two_sided_test=True,
     tfce=False,
     tfce_original_data=None,
-    random_state=None,
+    random_states=(None,),
     verbose=0,
+    neighbor_graph=None,
 ):
     """Perform massively univariate analysis with permuted OLS on a data chunk.
 
     To be used in a parallel computing context.
 
+    Permutations are performed in batches:
+    the permutations of a batch are drawn from the batch random state
+    and applied to the design, and all the permuted designs of a batch
+    are regressed against the target variates with a single matrix product.
+
     Parameters
     ----------
     scores_original_data : array-like, shape=(n_descriptors, n_regressors)
@@ -59,6 +73,7 @@ def _permuted_ols_on_chunk(
 
     target_vars : array-like, shape=(n_samples, n_targets)
         fMRI data. F-ordered for efficient computations.
+        This array is only read, so that it can be shared between workers.
 
     thread_id : int
         process id, used for display.
@@ -89,8 +104,10 @@ def _permuted_ols_on_chunk(
         Total number of permutations to perform, only used for
         display in this function.
 
-    n_perm_chunk : int, default=10000
-        Number of permutations to be performed.
+    perm_batch_sizes : sequence of int, default=(10000,)
+        Number of permutations to be performed in each batch.
+
+        .. nilearn_versionadded:: 0.14.1
 
     intercept_test : boolean, default=True
         Change the permutation scheme (swap signs for intercept,
@@ -118,10 +135,19 @@ def _permuted_ols_on_chunk(
 
         .. nilearn_versionadded:: 0.9.2
 
-    %(random_state)s
+    random_states : sequence of int or None, default=(None,)
+        Seed of the random generator of each batch of permutations.
+
+        .. nilearn_versionadded:: 0.14.1
 
     %(verbose0)s
 
+    neighbor_graph : None or array-like, shape=(2, n_edges), default=None
+        Pairs of neighboring descriptors in the mask of ``masker``.
+        Required if ``tfce`` is True.
+
+        .. nilearn_versionadded:: 0.14.1
+
     Returns
     -------
     scores_as_ranks_part : array-like, shape=(n_regressors, n_descriptors)
@@ -163,11 +189,15 @@ def _permuted_ols_on_chunk(
     .. footbibliography::
 
     """
-    # initialize the seed of the random generator
-    rng = check_random_state(random_state)
-
-    n_samples, n_regressors = tested_vars.shape
+    n_regressors = tested_vars.shape[1]
     n_descriptors = target_vars.shape[1]
+    n_perm_chunk = int(np.sum(perm_batch_sizes))
+
+    # tested vars and covars are permuted jointly
+    # to simplify t-scores computation (null dot product)
+    design = tested_vars
+    if confounding_vars is not None:
+        design = np.hstack((tested_vars, confounding_vars))
 
     # run the permutations
     t0 = time.time()
@@ -186,103 +216,55 @@ def _permuted_ols_on_chunk(
         h0_csfwe_part = np.empty((n_regressors, n_perm_chunk))
         h0_cmfwe_part = np.empty((n_regressors, n_perm_chunk))
 
-    for i_perm in range(n_perm_chunk):
-        if intercept_test:
-            # sign swap (random multiplication by 1 or -1)
-            target_vars = target_vars * (
-                rng.randint(2, size=(n_samples, 1)) * 2 - 1
-            )
-        else:
-            # shuffle data
-            # Regarding computation costs, we choose to shuffle testvars
-            # and covars rather than fmri_signal.
-            # Also, it is important to shuffle tested_vars and covars
-            # jointly to simplify t-scores computation (null dot product).
-            shuffle_idx = rng.permutation(n_samples)
-            tested_vars = tested_vars[shuffle_idx]
-            if confounding_vars is not None:
-                confounding_vars = confounding_vars[shuffle_idx]
+    i_perm = 0
+    for n_perm_batch, random_state in zip(
+        perm_batch_sizes, random_states, strict=True
+    ):
+        permuted_designs = _permute_design(
+            design, n_perm_batch, intercept_test, random_state
+        )
 
         # OLS regression on randomized data
-        perm_scores = np.asfortranarray(
-            t_score_with_covars_and_normalized_design(
-                tested_vars, target_vars, confounding_vars
-            )
+        batch_scores = t_score_with_permuted_designs(
+            permuted_designs, target_vars, n_regressors
         )
 
-        # find the rank of the original scores in h0_fmax_part
-        # (when n_descriptors or n_perm are large, it can be quite long to
-        #  find the rank of the original scores into the whole H0 distribution.
-        #  Here, it is performed in parallel by the workers involved in the
-        #  permutation computation)
-        # NOTE: This is not done for the cluster-level methods.
-        if two_sided_test:
-            # Get maximum absolute value for voxel-level FWE
-            h0_fmax_part[:, i_perm] = np.nanmax(np.fabs(perm_scores), axis=0)
-            scores_as_ranks_part += (
-                h0_fmax_part[:, i_perm].reshape((-1, 1))
-                < np.fabs(scores_original_data).T
-            )
-        else:
-            # Get maximum value for voxel-level FWE
-            h0_fmax_part[:, i_perm] = np.nanmax(perm_scores, axis=0)
-            scores_as_ranks_part += (
-                h0_fmax_part[:, i_perm].reshape((-1, 1))
-                < scores_original_data.T
-            )
-
-        # Prepare data for cluster thresholding
-        if tfce or (threshold is not None):
-            arr4d = masker.inverse_transform(perm_scores.T).get_fdata()
-            bin_struct = generate_binary_structure(3, 1)
-
-        if tfce:
-            # The TFCE map will contain positive and negative values if
-            # two_sided_test is True, or positive only if it's False.
-            # In either case, the maximum absolute value is the one we want.
-            h0_tfce_part[:, i_perm] = np.nanmax(
-                np.fabs(
-                    calculate_tfce(
-                        arr4d,
-                        bin_struct=bin_struct,
-                        two_sided_test=two_sided_test,
-                    )
-                ),
-                axis=(0, 1, 2),
-            )
-            tfce_scores_as_ranks_part += h0_tfce_part[:, i_perm].reshape(
-                (-1, 1)
-            ) < np.fabs(tfce_original_data.T)
-
-        if threshold is not None:
-            (
-                h0_csfwe_part[:, i_perm],
-                h0_cmfwe_part[:, i_perm],
-            ) = calculate_cluster_measures(
-                arr4d,
-                threshold,
-                bin_struct,
+        for perm_scores in batch_scores:
+            _update_h0_part(
+                np.asfortranarray(perm_scores),
+                i_perm,
+                scores_original_data,
+                h0_fmax_part,
+                scores_as_ranks_part,
+                threshold=threshold,
+                masker=masker,
                 two_sided_test=two_sided_test,
+                tfce=tfce,
+                tfce_original_data=tfce_original_data,
+                neighbor_graph=neighbor_graph,
+                h0_tfce_part=h0_tfce_part,
+                tfce_scores_as_ranks_part=tfce_scores_as_ranks_part,
+                h0_csfwe_part=h0_csfwe_part,
+                h0_cmfwe_part=h0_cmfwe_part,
             )
-
-        step = 11 - min(verbose, 10)
-        if i_perm % step == 0:
-            # If there is only one job, progress information is fixed
-            crlf = "\n"
-            if n_perm == n_perm_chunk:
-                crlf = "\r"
-
-            percent = float(i_perm) / n_perm_chunk
-            percent = round(percent * 100, 2)
-            dt = time.time() - t0
-            remaining = (100.0 - percent) / max(0.01, percent) * dt
-
-            logger.log(
-                f"Job #{thread_id}, processed {i_perm}/{n_perm_chunk} "
-                f"permutations ({percent:0.2f}%, {readable_time(remaining)} "
-                f"remaining){crlf}",
-                verbose=verbose,
-            )
+            i_perm += 1
+
+        # If there is only one job, progress information is fixed
+        crlf = "\n"
+        if n_perm == n_perm_chunk:
+            crlf = "\r"
+
+        percent = float(i_perm) / n_perm_chunk
+        percent = round(percent * 100, 2)
+        dt = time.time() - t0
+        remaining = (100.0 - percent) / max(0.01, percent) * dt
+
+        logger.log(
+            f"Job #{thread_id}, processed {i_perm}/{n_perm_chunk} "
+            f"permutations ({percent:0.2f}%, {readable_time(remaining)} "
+            f"remaining){crlf}",
+            verbose=verbose,
+        )
 
     return (
         scores_as_ranks_part,
@@ -294,6 +276,119 @@ def _permuted_ols_on_chunk(
     )
 
 
+def _permute_design(design, n_perm_batch, intercept_test, random_state):
+    """Draw a batch of permutations and apply them to the design.
+
+    Parameters
+    ----------
+    design : array-like, shape=(n_samples, n_regressors + n_covars)
+        Tested variates, followed by the covariates.
+
+    n_perm_batch : int
+        Number of permutations to draw.
+
+    intercept_test : boolean
+        If True, signs are swapped instead of labels.
+
+    %(random_state)s
+
+    Returns
+    -------
+    permuted_designs : numpy.ndarray, \
+            shape=(n_perm_batch, n_samples, n_regressors + n_covars)
+    """
+    # initialize the seed of the random generator
+    rng = check_random_state(random_state)
+    n_samples = design.shape[0]
+
+    if intercept_test:
+        # sign swap (random multiplication by 1 or -1)
+        # Swapping the signs of the samples of the target variates
+        # is equivalent to swapping the signs of the rows of the design.
+        signs = rng.randint(2, size=(n_perm_batch, n_samples, 1)) * 2 - 1
+        return design[np.newaxis] * signs
+
+    # shuffle data
+    # Regarding computation costs, we choose to shuffle testvars
+    # and covars rather than fmri_signal.
+    shuffle_idx = np.array(
+        [rng.permutation(n_samples) for _ in range(n_perm_batch)]
+    )
+    return design[shuffle_idx]
+
+
+def _update_h0_part(
+    perm_scores,
+    i_perm,
+    scores_original_data,
+    h0_fmax_part,
+    scores_as_ranks_part,
+    threshold,
+    masker,
+    two_sided_test,
+    tfce,
+    tfce_original_data,
+    neighbor_graph,
+    h0_tfce_part,
+    tfce_scores_as_ranks_part,
+    h0_csfwe_part,
+    h0_cmfwe_part,
+):
+    """Update the null distributions in place with one permutation."""
+    # find the rank of the original scores in h0_fmax_part
+    # (when n_descriptors or n_perm are large, it can be quite long to
+    #  find the rank of the original scores into the whole H0 distribution.
+    #  Here, it is performed in parallel by the workers involved in the
+    #  permutation computation)
+    # NOTE: This is not done for the cluster-level methods.
+    if two_sided_test:
+        # Get maximum absolute value for voxel-level FWE
+        h0_fmax_part[:, i_perm] = np.nanmax(np.fabs(perm_scores), axis=0)
+        scores_as_ranks_part += (
+            h0_fmax_part[:, i_perm].reshape((-1, 1))
+            < np.fabs(scores_original_data).T
+        )
+    else:
+        # Get maximum value for voxel-level FWE
+        h0_fmax_part[:, i_perm] = np.nanmax(perm_scores, axis=0)
+        scores_as_ranks_part += (
+            h0_fmax_part[:, i_perm].reshape((-1, 1)) < scores_original_data.T
+        )
+
+    if tfce:
+        # The TFCE map will contain positive and negative values if
+        # two_sided_test is True, or positive only if it's False.
+        # In either case, the maximum absolute value is the one we want.
+        # TFCE is computed directly on the masked scores.
+        h0_tfce_part[:, i_perm] = np.nanmax(
+            np.fabs(
+                calculate_tfce_on_graph(
+                    perm_scores,
+                    neighbor_graph,
+                    two_sided_test=two_sided_test,
+                )
+            ),
+            axis=0,
+        )
+        tfce_scores_as_ranks_part += h0_tfce_part[:, i_perm].reshape(
+            (-1, 1)
+        ) < np.fabs(tfce_original_data.T)
+
+    if threshold is not None:
+        # Prepare data for cluster thresholding
+        arr4d = masker.inverse_transform(perm_scores.T).get_fdata()
+        bin_struct = generate_binary_structure(3, 1)
+        (
+            h0_csfwe_part[:, i_perm],
+            h0_cmfwe_part[:, i_perm],
+        ) = calculate_cluster_measures(
+            arr4d,
+            threshold,
+            bin_struct,
+            two_sided_test=two_sided_test,
+        )
+
+
 @fill_doc
 def permuted_ols(
     tested_vars,
@@ -334,6 +429,9 @@ def permuted_ols(
     Each of them performs a fraction of permutations on the whole dataset.
     Thus, the max t-score amongst data descriptors can be computed directly,
     which avoids storing all the computed t-scores.
+    Permutations are drawn and applied to the design in batches,
+    independently of ``n_jobs``: for a given ``random_state``,
+    results are the same whatever the number of parallel workers.
 
     The variates should be given C-contiguous.
     ``target_vars`` are fortran-ordered automatically to speed-up computations.
@@ -710,23 +808,17 @@ def permuted_ols(
     bin_struct = generate_binary_structure(3, 1)
 
     tfce_original_data = None
+    neighbor_graph = None
     if tfce:
-        scores_4d = masker.inverse_transform(
-            scores_original_data.T
-        ).get_fdata()
-        tfce_original_data = calculate_tfce(
-            scores_4d,
-            bin_struct=bin_struct,
+        # the neighbors of each voxel of the mask are the same
+        # for all permutations
+        mask, _ = load_mask_img(masker.mask_img_)
+        neighbor_graph = get_neighbor_graph(mask, bin_struct)
+        tfce_original_data = calculate_tfce_on_graph(
+            scores_original_data,
+            neighbor_graph,
             two_sided_test=two_sided_test,
         )
-        tfce_original_data = apply_mask(
-            Nifti1Image(
-                tfce_original_data,
-                masker.mask_img_.affine,
-                masker.mask_img_.header,
-            ),
-            masker.mask_img_,
-        ).T
 
     # 0 or negative number of permutations => original data scores only
     if n_perm <= 0:
@@ -740,10 +832,7 @@ def permuted_ols(
 
     # Permutations
     # parallel computing units perform a reduced number of permutations each
-    if n_perm > n_jobs:
-        n_perm_chunks = np.asarray([n_perm / n_jobs] * n_jobs, dtype=int)
-        n_perm_chunks[-1] += n_perm % n_jobs
-    else:
+    if n_perm <= n_jobs:
         warnings.warn(
             f"The specified number of permutations is {n_perm} "
             "and the number of jobs to be performed in parallel "
@@ -754,15 +843,42 @@ def permuted_ols(
             UserWarning,
             stacklevel=find_stack_level(),
         )
-        n_perm_chunks = np.ones(n_perm, dtype=int)
+
+    # Permutations are drawn and regressed in batches.
+    # The batches, and the seed of each batch,
+    # do not depend on n_jobs, so that results are reproducible
+    # for a given random_state whatever the number of jobs.
+    n_columns = testedvars_resid_covars.shape[1] + (
+        0
+        if covars_orthonormalized is None
+        else covars_orthonormalized.shape[1]
+    )
+    n_perm_batch = _get_n_perm_batch(n_perm, n_descriptors, n_columns)
+    perm_batch_sizes = np.full(n_perm // n_perm_batch, n_perm_batch)
+    if n_perm % n_perm_batch:
+        perm_batch_sizes = np.append(perm_batch_sizes, n_perm % n_perm_batch)
+    # seeded from a random integer between 0 and maximum
+    # value represented by np.int32 (to have a large entropy).
+    random_states = rng.randint(
+        1, np.iinfo(np.int32).max - 1, size=len(perm_batch_sizes)
+    )
+    job_batches = [
+        batches
+        for batches in np.array_split(np.arange(len(perm_batch_sizes)), n_jobs)
+        if len(batches) > 0
+    ]
 
     threshold_t = _compute_t_stat_threshold(
         threshold, two_sided_test, tested_vars, confounding_vars
     )
 
-    # actual permutations, seeded from a random integer between 0 and maximum
-    # value represented by np.int32 (to have a large entropy).
-    ret = joblib.Parallel(n_jobs=n_jobs, verbose=verbose)(
+    # actual permutations
+    # The target variates are only read by the workers:
+    # joblib shares them through a read-only memory map
+    # instead of sending a copy to each worker.
+    ret = joblib.Parallel(
+        n_jobs=n_jobs, verbose=verbose, max_nbytes="1M", mmap_mode="r"
+    )(
         joblib.delayed(_permuted_ols_on_chunk)(
             scores_original_data,
             testedvars_resid_covars,
@@ -772,15 +888,16 @@ def permuted_ols(
             confounding_vars=covars_orthonormalized,
             masker=masker,
             n_perm=n_perm,
-            n_perm_chunk=n_perm_chunk,
+            perm_batch_sizes=perm_batch_sizes[batches],
             intercept_test=intercept_test,
             two_sided_test=two_sided_test,
             tfce=tfce,
             tfce_original_data=tfce_original_data,
-            random_state=rng.randint(1, np.iinfo(np.int32).max - 1),
+            random_states=random_states[batches],
             verbose=verbose,
+            neighbor_graph=neighbor_graph,
         )
-        for thread_id, n_perm_chunk in enumerate(n_perm_chunks)
+        for thread_id, batches in enumerate(job_batches)
     )
 
     # reduce results
@@ -839,6 +956,27 @@ def permuted_ols(
     )
 
 
+def _get_n_perm_batch(n_perm, n_descriptors, n_columns):
+    """Return the number of permutations regressed in a single product.
+
+    Batches are small enough to keep the t-scores of a batch
+    within ``_PERM_BATCH_MAX_BYTES``,
+    and there are at least ``_PERM_BATCH_MIN_BATCHES`` batches
+    to share between parallel workers.
+    """
+    max_by_memory = _PERM_BATCH_MAX_BYTES // (8 * n_descriptors * n_columns)
+    return int(
+        max(
+            1,
+            min(
+                _PERM_BATCH_MAX_SIZE,
+                max_by_memory,
+                n_perm // _PERM_BATCH_MIN_BATCHES,
+            ),
+        )
+    )
+
+
 def _make_array_contiguous(array):
     """Make arrays contiguous for code efficiency."""
     if not array.flags["C_CONTIGUOUS"]:
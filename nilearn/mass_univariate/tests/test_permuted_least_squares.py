@@ -993,3 +993,38 @@ def test_cluster_level_parameters_error_no_masker(cluster_level_design):
             threshold=0.001,
             tfce=False,
         )
+
+
+@pytest.mark.thread_unsafe
+@pytest.mark.parametrize("intercept_test", [True, False])
+def test_permuted_ols_reproducible_across_n_jobs(
+    rng, monkeypatch, intercept_test
+):
+    """Check results only depend on random_state, not on n_jobs."""
+    # n_jobs is capped by the number of CPUs
+    monkeypatch.setattr(
+        "nilearn.mass_univariate.permuted_least_squares.joblib.cpu_count",
+        lambda: 4,
+    )
+    target_vars = rng.standard_normal((N_SAMPLES, 20))
+    if intercept_test:
+        tested_vars = np.ones((N_SAMPLES, 1))
+    else:
+        tested_vars = rng.standard_normal((N_SAMPLES, 1))
+    confounding_vars = rng.standard_normal((N_SAMPLES, N_COVARS))
+
+    outputs = [
+        permuted_ols(
+            tested_vars,
+            target_vars,
+            confounding_vars,
+            n_perm=100,
+            random_state=0,
+            n_jobs=n_jobs,
+        )
+        for n_jobs in [1, 2, 3]
+    ]
+
+    for output in outputs[1:]:
+        assert_equal(output["h0_max_t"], outputs[0]["h0_max_t"])
+        assert_equal(output["logp_max_t"], outputs[0]["logp_max_t"])
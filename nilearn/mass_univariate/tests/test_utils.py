@@ -5,7 +5,7 @@ import math
 import numpy as np
 import pytest
 from numpy.testing import assert_array_almost_equal
-from scipy.ndimage import generate_binary_structure
+from scipy.ndimage import generate_binary_structure, label
 
 from nilearn.conftest import _rng
 from nilearn.mass_univariate import _utils
@@ -64,6 +64,91 @@ def test_calculate_tfce(two_sided_test, dh, true_max_tfce):
     assert np.max(np.abs(test_tfce_arr4d)) == true_max_tfce
 
 
+def _naive_tfce(arr3d, bin_struct, score_threshs, E, H):
+    """Compute one-sided TFCE by labelling clusters at each threshold."""
+    tfce = np.zeros(arr3d.shape)
+    for score_thresh in score_threshs:
+        labeled, _ = label(arr3d >= score_thresh, bin_struct)
+        sizes = np.bincount(labeled.ravel())
+        sizes[0] = 0
+        tfce += sizes[labeled] ** E * score_thresh**H
+    return tfce
+
+
+def test_get_neighbor_graph():
+    """Test that each pair of neighboring voxels is listed once."""
+    mask = np.zeros((3, 3, 3), dtype=bool)
+    mask[1, 1, :] = True
+    mask[0, 1, 1] = True
+
+    neighbor_graph = _utils.get_neighbor_graph(
+        mask, generate_binary_structure(3, 1)
+    )
+
+    # masked voxels, in C order: (0, 1, 1), (1, 1, 0), (1, 1, 1), (1, 1, 2)
+    assert neighbor_graph.shape == (2, 3)
+    assert {tuple(sorted(edge)) for edge in neighbor_graph.T} == {
+        (0, 2),
+        (1, 2),
+        (2, 3),
+    }
+
+    neighbor_graph = _utils.get_neighbor_graph(
+        mask, generate_binary_structure(3, 3)
+    )
+
+    assert neighbor_graph.shape == (2, 5)
+
+
+@pytest.mark.parametrize("connectivity", [1, 3])
+@pytest.mark.parametrize("E, H", [(0.5, 2), (1, 1)])
+def test_calculate_tfce_against_naive_implementation(connectivity, E, H):
+    """Check that the incremental sweep matches labelling every threshold."""
+    rng = _rng()
+    arr3d = rng.standard_normal((8, 9, 7))
+    arr3d[arr3d < 0.2] = 0
+    bin_struct = generate_binary_structure(3, connectivity)
+    score_threshs = np.linspace(0.1, arr3d.max(), 37)
+
+    expected = _naive_tfce(arr3d, bin_struct, score_threshs, E, H)
+    mask = np.ones(arr3d.shape, dtype=bool)
+    tfce = _utils._calculate_tfce_one_map(
+        arr3d.ravel(),
+        _utils.get_neighbor_graph(mask, bin_struct),
+        score_threshs,
+        E=E,
+        H=H,
+        two_sided_test=False,
+    )
+
+    assert_array_almost_equal(tfce.reshape(arr3d.shape), expected)
+
+
+@pytest.mark.parametrize("two_sided_test", [True, False])
+def test_calculate_tfce_on_graph(two_sided_test):
+    """Check that TFCE on the masked voxels matches TFCE on the volume."""
+    rng = _rng()
+    mask = rng.random((7, 8, 9)) > 0.2
+    arr4d = np.zeros((*mask.shape, 3))
+    arr4d[mask] = rng.standard_normal((mask.sum(), 3)) * 3
+    bin_struct = generate_binary_structure(3, 1)
+
+    expected = _utils.calculate_tfce(
+        arr4d, bin_struct=bin_struct, two_sided_test=two_sided_test
+    )
+    tfce = _utils.calculate_tfce_on_graph(
+        arr4d[mask],
+        _utils.get_neighbor_graph(mask, bin_struct),
+        two_sided_test=two_sided_test,
+    )
+
+    assert tfce.shape == (mask.sum(), 3)
+    assert_array_almost_equal(tfce, expected[mask])
+    assert np.all(expected[~mask] == 0)
+    if not two_sided_test:
+        assert np.all(tfce[arr4d[mask] <= 0] == 0)
+
+
 @pytest.mark.parametrize(
     "test_values, expected_p_value", [(9, 0.95), (-9, 0.15), (0, 0.4)]
 )
@@ -269,6 +354,38 @@ def test_t_score_with_covars_and_normalized_design_withcovar(rng):
     assert_array_almost_equal(own_score, ref_score)
 
 
+@pytest.mark.parametrize("n_covars", [0, 2])
+def test_t_score_with_permuted_designs(rng, n_covars):
+    """Test batched t-scores match the t-scores of each permuted design."""
+    n_samples, n_perm, n_tested_vars = 30, 5, 2
+    tested_vars = _utils.normalize_matrix_on_axis(
+        rng.standard_normal((n_samples, n_tested_vars))
+    )
+    target_vars = _utils.normalize_matrix_on_axis(
+        rng.standard_normal((n_samples, 7))
+    )
+    covars = _utils.orthonormalize_matrix(
+        rng.standard_normal((n_samples, n_covars))
+    )
+    permutations = np.array(
+        [rng.permutation(n_samples) for _ in range(n_perm)]
+    )
+    design = np.hstack([tested_vars, covars])
+
+    scores = _utils.t_score_with_permuted_designs(
+        design[permutations], target_vars, n_tested_vars
+    )
+
+    assert scores.shape == (n_perm, 7, n_tested_vars)
+    for i_perm, permutation in enumerate(permutations):
+        expected = _utils.t_score_with_covars_and_normalized_design(
+            tested_vars[permutation],
+            target_vars,
+            covars[permutation] if n_covars else None,
+        )
+        assert_array_almost_equal(scores[i_perm], expected)
+
+
 @pytest.mark.parametrize("two_sided_test", [True, False])
 @pytest.mark.parametrize(
     "dh",
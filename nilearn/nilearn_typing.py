@@ -42,6 +42,7 @@ AvailableMeshes: TypeAlias = Literal[
 ]
 BgOnData: TypeAlias = bool
 BorderSize: TypeAlias = Integer
+ChunkSize: TypeAlias = Integer | None
 ColorBar: TypeAlias = bool
 ClusterThreshold: TypeAlias = Integer
 Connected: TypeAlias = bool
@@ -17,7 +17,7 @@ from sklearn.utils.validation import check_is_fitted
 
 from nilearn._base import NilearnBaseEstimator
 from nilearn._utils import logger
-from nilearn._utils.cache_mixin import check_memory
+from nilearn._utils.cache_mixin import cache, check_memory
 from nilearn._utils.docs import fill_doc
 from nilearn._utils.logger import find_stack_level
 from nilearn._utils.param_validation import check_params
@@ -793,7 +793,7 @@ class ReNA(
                 stacklevel=find_stack_level(),
             )
 
-        _, labels = self.memory_.cache(recursive_neighbor_agglomeration)(
+        _, labels = cache(recursive_neighbor_agglomeration, self.memory_)(
             X,
             self.mask_img_,
             self.n_clusters,
@@ -12,7 +12,7 @@ from typing import Literal, overload
 import numpy as np
 from joblib import Parallel, delayed
 from nibabel import Nifti1Image
-from scipy import linalg, ndimage
+from scipy import linalg, ndimage, sparse
 
 from nilearn import masking
 from nilearn._utils.docs import fill_doc
@@ -27,6 +27,9 @@ from nilearn.image import check_niimg_3d, check_niimg_4d, new_img_like
 
 INF = 1000 * np.finfo(np.float32).eps
 
+# reduction strategies computed with a sparse operator
+_SPARSE_STRATEGIES = ("mean", "sum")
+
 
 def _check_shape_compatibility(img1, img2, dim=None) -> None:
     """Check that shapes match for dimensions going from 0 to dim-1.
@@ -224,6 +227,93 @@ def _get_labels_data(
     return labels, labels_data
 
 
+class _LabelsOperator:
+    """Sparse operator computing the mean or sum of the voxels of regions.
+
+    Extracting the signals of all the regions is a single product
+    of a sparse (n_regions, n_voxels) matrix with the data of the voxels
+    that belong to a region,
+    instead of one pass over the whole volume per sample.
+
+    Parameters
+    ----------
+    labels_img : Niimg-like object
+        Regions definition as labels, used to check images.
+
+    labels : :obj:`list`
+        Labels of the regions, in the order of the extracted signals.
+
+    labels_data : :class:`numpy.ndarray`
+        Labels of each voxel, after applying the mask.
+
+    strategy : {"mean", "sum"}
+        Reduction applied to the voxels of each region.
+    """
+
+    def __init__(self, labels_img, labels, labels_data, strategy):
+        self.labels_img = labels_img
+        self.labels = labels
+        self.labels_data = labels_data
+        self.strategy = strategy
+
+        labels_array = np.asarray(labels)
+        order = np.argsort(labels_array, kind="stable")
+        # voxels are visited in C order, like in scipy.ndimage
+        flat_labels = labels_data.ravel()
+        position = np.searchsorted(labels_array[order], flat_labels)
+        position = np.minimum(position, max(len(labels) - 1, 0))
+        in_region = np.zeros(flat_labels.shape, dtype=bool)
+        if len(labels):
+            in_region = labels_array[order][position] == flat_labels
+        voxels = np.flatnonzero(in_region)
+        regions = order[position[in_region]]
+
+        # The data of 4D images are indexed in Fortran order.
+        self.voxel_indices = np.ravel_multi_index(
+            np.unravel_index(voxels, labels_data.shape),
+            labels_data.shape,
+            order="F",
+        )
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(voxels)), (regions, np.arange(len(voxels)))),
+            shape=(len(labels), len(voxels)),
+        )
+        self.counts = np.bincount(regions, minlength=len(labels))
+
+    def reduce(self, data):
+        """Compute the signals of the regions.
+
+        Parameters
+        ----------
+        data : :class:`numpy.ndarray` of shape (x, y, z, n_samples)
+            Data of the image.
+
+        Returns
+        -------
+        signals : :class:`numpy.ndarray` of shape (n_samples, n_regions)
+            Signals of the regions.
+            Signals of regions without any voxel are zero.
+        """
+        voxels_data = data.reshape((-1, data.shape[-1]), order="F")[
+            self.voxel_indices
+        ]
+        signals = self.matrix @ voxels_data
+        if self.strategy == "mean":
+            signals = np.divide(
+                signals,
+                self.counts[:, np.newaxis],
+                out=np.zeros_like(signals),
+                where=self.counts[:, np.newaxis] > 0,
+            )
+        return signals.T
+
+    def masked_atlas(self):
+        """Return the regions definition after applying the mask."""
+        return Nifti1Image(
+            self.labels_data.astype(np.int8), self.labels_img.affine
+        )
+
+
 # FIXME: naming scheme is not really satisfying. Any better idea appreciated.
 @overload
 def img_to_signals_labels(
@@ -390,14 +480,19 @@ def img_to_signals_labels(
 
     data = safe_get_data(imgs, ensure_finite=True)
     target_datatype = np.float32 if data.dtype == np.float32 else np.float64
-    # Nilearn issue: 2135, PR: 2195 for why this is necessary.
-    reduction_function = partial(
-        getattr(ndimage, strategy), labels=labels_data, index=labels
-    )
-    # Parallel reduction across samples
-    signals = Parallel(n_jobs=n_jobs)(
-        delayed(reduction_function)(img) for img in np.rollaxis(data, -1)
-    )
+    if strategy in _SPARSE_STRATEGIES:
+        signals = _LabelsOperator(
+            labels_img, labels, labels_data, strategy
+        ).reduce(data)
+    else:
+        # Nilearn issue: 2135, PR: 2195 for why this is necessary.
+        reduction_function = partial(
+            getattr(ndimage, strategy), labels=labels_data, index=labels
+        )
+        # Parallel reduction across samples
+        signals = Parallel(n_jobs=n_jobs)(
+            delayed(reduction_function)(img) for img in np.rollaxis(data, -1)
+        )
     signals = np.asarray(signals, dtype=target_datatype, order=order)
     # Set to zero signals for missing labels. Workaround for Scipy behavior
     if keep_masked_labels:
@@ -427,6 +522,49 @@ def img_to_signals_labels(
         return signals, labels
 
 
+def _get_labels_operator(
+    labels_img, mask_img=None, background_label=0, strategy="mean"
+):
+    """Return the sparse operator extracting signals of labels, or None.
+
+    None is returned for strategies that are not a mean or a sum.
+    """
+    if strategy not in _SPARSE_STRATEGIES:
+        return None
+    labels_img = check_niimg_3d(labels_img)
+    labels, labels_data = _get_labels_data(
+        labels_img, labels_img, mask_img, background_label
+    )
+    return _LabelsOperator(labels_img, labels, labels_data, strategy)
+
+
+def _img_to_signals_labels_operator(imgs, labels_operator, order="F"):
+    """Extract region signals with a precomputed operator.
+
+    This is equivalent to :func:`img_to_signals_labels`,
+    for the labels image, mask and strategy of the operator.
+
+    Returns
+    -------
+    signals : :class:`numpy.ndarray`
+        Signals extracted from each region.
+
+    labels : :obj:`list`
+        Corresponding labels for each signal.
+
+    masked_atlas : :class:`nibabel.nifti1.Nifti1Image`
+        Regions definition as labels after applying the mask.
+    """
+    imgs = check_niimg_4d(imgs)
+    _check_shape_and_affine_compatibility(imgs, labels_operator.labels_img)
+    data = safe_get_data(imgs, ensure_finite=True)
+    target_datatype = np.float32 if data.dtype == np.float32 else np.float64
+    signals = np.asarray(
+        labels_operator.reduce(data), dtype=target_datatype, order=order
+    )
+    return signals, labels_operator.labels, labels_operator.masked_atlas()
+
+
 def signals_to_img_labels(
     signals, labels_img, mask_img=None, background_label=0, order="F"
 ) -> Nifti1Image:
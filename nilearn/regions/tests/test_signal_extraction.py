@@ -6,6 +6,7 @@ import numpy as np
 import pytest
 from nibabel import Nifti1Image
 from numpy.testing import assert_almost_equal, assert_equal
+from scipy import ndimage
 
 from nilearn._utils.data_gen import (
     generate_fake_fmri,
@@ -19,6 +20,8 @@ from nilearn.exceptions import DimensionError
 from nilearn.image import get_data
 from nilearn.regions.signal_extraction import (
     _check_shape_and_affine_compatibility,
+    _get_labels_operator,
+    _img_to_signals_labels_operator,
     _trim_maps,
     img_to_signals_labels,
     img_to_signals_maps,
@@ -815,3 +818,51 @@ def test_img_to_signals_labels_parallel_extraction(fmri_img, labeled_regions):
     )
     np.testing.assert_almost_equal(labels_signals, expected_labels_signals)
     assert np.allclose(labels_labels, expected_labels_labels)
+
+
+@pytest.mark.parametrize("strategy", ["mean", "sum"])
+@pytest.mark.parametrize("with_mask", [False, True])
+def test_img_to_signals_labels_operator(
+    rng, labeled_regions, mask_img, strategy, with_mask
+):
+    """Check that the sparse operator matches scipy.ndimage reductions."""
+    data = rng.standard_normal((*_shape_3d_default(), N_TIMEPOINTS))
+    fmri_img = Nifti1Image(data, _affine_eye())
+    if not with_mask:
+        mask_img = None
+
+    labels_data = get_data(labeled_regions)
+    if with_mask:
+        labels_data = np.where(get_data(mask_img) > 0, labels_data, 0)
+    labels = list(np.unique(labels_data)[1:])
+    expected = np.stack(
+        [
+            getattr(ndimage, strategy)(
+                volume, labels=labels_data, index=labels
+            )
+            for volume in np.rollaxis(data, -1)
+        ]
+    )
+
+    signals, signals_labels, _ = img_to_signals_labels(
+        fmri_img, labeled_regions, mask_img=mask_img, strategy=strategy
+    )
+
+    assert signals_labels == labels
+    assert_almost_equal(signals, expected)
+
+    labels_operator = _get_labels_operator(
+        labeled_regions, mask_img=mask_img, strategy=strategy
+    )
+    operator_signals, operator_labels, masked_atlas = (
+        _img_to_signals_labels_operator(fmri_img, labels_operator)
+    )
+
+    assert operator_labels == labels
+    assert_equal(operator_signals, signals)
+    assert_equal(get_data(masked_atlas), labels_data)
+
+
+def test_get_labels_operator_other_strategies(labeled_regions):
+    """Check that no operator is built for other reductions."""
+    assert _get_labels_operator(labeled_regions, strategy="median") is None
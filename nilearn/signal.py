@@ -11,6 +11,7 @@ from typing import TYPE_CHECKING, Literal
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from scipy import linalg
 from scipy import signal as sp_signal
 from scipy.interpolate import CubicSpline
@@ -43,6 +44,9 @@ __all__ = [
 
 AVAILABLE_FILTERS = ("butterworth", "cosine")
 
+# Size of the blocks of columns cleaned at once by clean
+_CLEAN_BLOCK_BYTES = 2**20
+
 
 @fill_doc
 def standardize_signal(
@@ -318,6 +322,63 @@ def _check_wn(btype, freq, nyq):
     return freq
 
 
+def _butterworth_sos(sampling_rate, low_pass, high_pass, order=5):
+    """Design the second-order sections of a Butterworth filter.
+
+    Returns None if signals must not be filtered.
+    """
+    if low_pass is None and high_pass is None:
+        return None
+
+    if (
+        low_pass is not None
+        and high_pass is not None
+        and high_pass >= low_pass
+    ):
+        raise ValueError(
+            f"High pass cutoff frequency ({high_pass}) is greater than or "
+            f"equal to low pass filter frequency ({low_pass}). "
+            "This case is not handled by this function."
+        )
+
+    nyq = sampling_rate * 0.5
+
+    critical_freq = []
+    if high_pass is not None:
+        btype = "high"
+        critical_freq.append(_check_wn(btype, high_pass, nyq))
+
+    if low_pass is not None:
+        btype = "low"
+        critical_freq.append(_check_wn(btype, low_pass, nyq))
+
+    if len(critical_freq) == 2:
+        btype = "band"
+        # Inappropriate parameter input might lead to coercion of both
+        # elements of critical_freq to a value just below Nyquist.
+        # Scipy fix now enforces that critical frequencies cannot be equal.
+        # See https://github.com/scipy/scipy/pull/15886.
+        # If this is the case, we return the signals unfiltered.
+        if critical_freq[0] == critical_freq[1]:
+            warnings.warn(
+                "Signals are returned unfiltered because band-pass critical "
+                "frequencies are equal. Please check that inputs for "
+                "sampling_rate, low_pass, and high_pass are valid.",
+                stacklevel=find_stack_level(),
+            )
+            return None
+    else:
+        critical_freq = critical_freq[0]
+
+    return sp_signal.butter(
+        N=order,
+        Wn=critical_freq,
+        btype=btype,
+        output="sos",
+        fs=sampling_rate,
+    )
+
+
 @fill_doc
 def butterworth(
     signals,
@@ -405,56 +466,10 @@ def butterworth(
 
     """
     check_params(locals())
-    if low_pass is None and high_pass is None:
+    sos = _butterworth_sos(sampling_rate, low_pass, high_pass, order)
+    if sos is None:
         return signals.copy() if copy else signals
 
-    if (
-        low_pass is not None
-        and high_pass is not None
-        and high_pass >= low_pass
-    ):
-        raise ValueError(
-            f"High pass cutoff frequency ({high_pass}) is greater than or "
-            f"equal to low pass filter frequency ({low_pass}). "
-            "This case is not handled by this function."
-        )
-
-    nyq = sampling_rate * 0.5
-
-    critical_freq = []
-    if high_pass is not None:
-        btype = "high"
-        critical_freq.append(_check_wn(btype, high_pass, nyq))
-
-    if low_pass is not None:
-        btype = "low"
-        critical_freq.append(_check_wn(btype, low_pass, nyq))
-
-    if len(critical_freq) == 2:
-        btype = "band"
-        # Inappropriate parameter input might lead to coercion of both
-        # elements of critical_freq to a value just below Nyquist.
-        # Scipy fix now enforces that critical frequencies cannot be equal.
-        # See https://github.com/scipy/scipy/pull/15886.
-        # If this is the case, we return the signals unfiltered.
-        if critical_freq[0] == critical_freq[1]:
-            warnings.warn(
-                "Signals are returned unfiltered because band-pass critical "
-                "frequencies are equal. Please check that inputs for "
-                "sampling_rate, low_pass, and high_pass are valid.",
-                stacklevel=find_stack_level(),
-            )
-            return signals.copy() if copy else signals
-    else:
-        critical_freq = critical_freq[0]
-
-    sos = sp_signal.butter(
-        N=order,
-        Wn=critical_freq,
-        btype=btype,
-        output="sos",
-        fs=sampling_rate,
-    )
     if signals.ndim == 1:
         # 1D case
         output = sp_signal.sosfiltfilt(
@@ -586,6 +601,7 @@ def clean(
     t_r: Tr = 2.5,
     ensure_finite: bool = False,
     extrapolate: bool = False,
+    n_jobs: int = 1,
     **kwargs,
 ) -> np.ndarray:
     """Improve :term:`SNR` on masked :term:`fMRI` signals.
@@ -702,6 +718,12 @@ def clean(
         .. nilearn_versionchanged:: 0.13.0
             Default changed to False.
 
+    %(n_jobs)s
+        Blocks of features are cleaned in parallel by this number
+        of threads.
+
+        .. nilearn_versionadded:: 0.14.1
+
     kwargs : :obj:`dict`
         Keyword arguments to be passed to functions called within ``clean``.
         Kwargs prefixed with ``'butterworth__'`` will be passed to
@@ -758,6 +780,7 @@ def clean(
             low_pass_,
             high_pass_,
             t_r_,
+            n_jobs,
         )
 
     # For the following steps, sample_mask should be either None or index-like
@@ -777,21 +800,15 @@ def clean(
     signals, confounds, sample_mask = _handle_scrubbed_volumes(
         signals, confounds, sample_mask, filter_type, t_r, extrapolate
     )
-    # Detrend
     # Detrend and filtering should apply to confounds, if confound presents
     # keep filters orthogonal (according to Lindquist et al. (2018))
-    # Restrict the signal to the orthogonal of the confounds
-    original_mean_signals = signals.mean(axis=0)
-    if detrend:
-        signals = standardize_signal(
-            signals, standardize=None, detrend=detrend
+    if detrend and confounds is not None:
+        confounds = standardize_signal(
+            confounds, standardize=None, detrend=detrend
         )
-        if confounds is not None:
-            confounds = standardize_signal(
-                confounds, standardize=None, detrend=detrend
-            )
 
-    # Butterworth filtering
+    sos = None
+    filtfilt_kwargs = {}
     if filter_type == "butterworth":
         if TYPE_CHECKING:
             # guaranteed by _check_filter_parameters
@@ -801,82 +818,255 @@ def clean(
             for k, v in kwargs.items()
             if k.startswith("butterworth__")
         }
-        signals = butterworth(
-            signals,
-            sampling_rate=1.0 / t_r_,
-            low_pass=low_pass_,
-            high_pass=high_pass_,
-            **butterworth_kwargs,
+        sos = _butterworth_sos(
+            1.0 / t_r_,
+            low_pass_,
+            high_pass_,
+            order=butterworth_kwargs.get("order", 5),
         )
-        if confounds is not None:
+        filtfilt_kwargs = {
+            k: v
+            for k, v in butterworth_kwargs.items()
+            if k in ("padtype", "padlen")
+        }
+        if sos is not None and confounds is not None:
             # Apply low- and high-pass filters to keep filters orthogonal
             # (according to Lindquist et al. (2018))
-            confounds = butterworth(
-                confounds,
-                sampling_rate=1.0 / t_r_,
-                low_pass=low_pass_,
-                high_pass=high_pass_,
-                **butterworth_kwargs,
-            )
-
-        # apply sample_mask to remove censored volumes after signal filtering
-        if sample_mask is not None:
-            signals, confounds = _censor_signals(
-                signals, confounds, sample_mask
+            confounds = sp_signal.sosfiltfilt(
+                sos, confounds, axis=0, **filtfilt_kwargs
             )
+        if sample_mask is not None and confounds is not None:
+            confounds = confounds[sample_mask, :]
 
     # Remove confounds
     if confounds is not None:
-        tmp = None if standardize_confounds is False else "zscore_sample"
-        confounds = standardize_signal(
-            confounds,
-            standardize=tmp,
-            detrend=False,
+        confounds = _confounds_basis(confounds, standardize_confounds)
+
+    detrend_basis = _detrend_basis(signals.shape[0]) if detrend else None
+
+    return _clean_in_blocks(
+        signals,
+        detrend_basis=detrend_basis,
+        sos=sos,
+        filtfilt_kwargs=filtfilt_kwargs,
+        sample_mask=sample_mask if sos is not None else None,
+        confounds_basis=confounds,
+        standardize=standardize,
+        n_jobs=n_jobs,
+    )
+
+
+def _confounds_basis(confounds, standardize_confounds):
+    """Return an orthonormal basis of the space spanned by confounds."""
+    tmp = None if standardize_confounds is False else "zscore_sample"
+    confounds = standardize_signal(
+        confounds,
+        standardize=tmp,
+        detrend=False,
+    )
+
+    if not standardize_confounds:
+        # Improve numerical stability by controlling the range of
+        # confounds. We don't rely on standardize_signal as it removes any
+        # constant contribution to confounds.
+        confound_max = np.max(np.abs(confounds), axis=0)
+        confound_max[confound_max == 0] = 1
+        confounds /= confound_max
+
+    # Pivoting in qr decomposition was added in scipy 0.10
+    Q, R, _ = linalg.qr(confounds, mode="economic", pivoting=True)
+    return Q[:, np.abs(np.diag(R)) > np.finfo(np.float64).eps * 100.0]
+
+
+def _detrend_basis(n_time):
+    """Return an orthonormal basis of constant and linear trends.
+
+    Projecting signals on its orthogonal is equivalent to
+    :func:`_detrend`.
+    """
+    if n_time == 1:
+        warnings.warn(
+            "Detrending of 3D signal has been requested but "
+            "would lead to zero values. Skipping.",
+            stacklevel=find_stack_level(),
         )
+        return None
+    regressor = np.arange(n_time, dtype=np.float64)
+    regressor -= regressor.mean()
+    regressor /= np.sqrt((regressor**2).sum())
+    return np.column_stack([np.full(n_time, 1.0 / np.sqrt(n_time)), regressor])
 
-        if not standardize_confounds:
-            # Improve numerical stability by controlling the range of
-            # confounds. We don't rely on standardize_signal as it removes any
-            # constant contribution to confounds.
-            confound_max = np.max(np.abs(confounds), axis=0)
-            confound_max[confound_max == 0] = 1
-            confounds /= confound_max
 
-        # Pivoting in qr decomposition was added in scipy 0.10
-        Q, R, _ = linalg.qr(confounds, mode="economic", pivoting=True)
-        Q = Q[:, np.abs(np.diag(R)) > np.finfo(np.float64).eps * 100.0]
-        signals -= Q.dot(Q.T).dot(signals)
+def _clean_in_blocks(
+    signals,
+    detrend_basis,
+    sos,
+    filtfilt_kwargs,
+    sample_mask,
+    confounds_basis,
+    standardize,
+    n_jobs=1,
+):
+    """Detrend, filter, remove confounds and standardize signals.
 
-    # Standardize
-    if not standardize:
+    All steps are applied to blocks of columns in place,
+    blocks being small enough to stay in the CPU cache
+    and being processed in parallel by a pool of threads.
+
+    When signals are not filtered, removing trends and confounds
+    are folded into a single projection
+    on the orthogonal of the trends and the detrended confounds.
+    Signals are censored with ``sample_mask`` after filtering,
+    which is only done when ``sos`` is given.
+    """
+    n_time, n_features = signals.shape
+    projection_basis = confounds_basis
+    if sos is None and detrend_basis is not None:
+        projection_basis = (
+            detrend_basis
+            if confounds_basis is None
+            else np.hstack([detrend_basis, confounds_basis])
+        )
+        detrend_basis = None
+
+    if (
+        detrend_basis is None
+        and sos is None
+        and projection_basis is None
+        and not standardize
+    ):
         return signals
 
+    out = signals
+    if sample_mask is not None:
+        n_kept = np.arange(n_time)[sample_mask].size
+        out = np.empty((n_kept, n_features), dtype=signals.dtype)
+
+    n_columns = max(1, _CLEAN_BLOCK_BYTES // (n_time * signals.itemsize))
+    blocks = list(
+        gen_even_slices(n_features, max(1, -(-n_features // n_columns)))
+    )
+    parallel = Parallel(n_jobs=n_jobs, prefer="threads")
+
+    means = parallel(
+        delayed(_clean_block)(
+            signals,
+            out,
+            block,
+            detrend_basis,
+            sos,
+            filtfilt_kwargs,
+            sample_mask,
+            projection_basis,
+        )
+        for block in blocks
+    )
+    if not standardize:
+        return out
+
+    original_mean_signals = np.concatenate([mean[0] for mean in means])
+    mean_signals = np.concatenate([mean[1] for mean in means])
+
+    if out.shape[0] == 1:
+        warnings.warn(
+            "Standardization of 3D signal has been requested but "
+            "would lead to zero values. Skipping.",
+            stacklevel=find_stack_level(),
+        )
+        return out
+
     # detect if mean is close to zero; This can obscure the scale of the signal
     # with percent signal change standardization. This should happen when the
     # data was 1. detrended 2. high pass filtered.
+    # If the signal is detrended, the mean signal will be zero or close to
+    # zero. If signal is high pass filtered with butterworth, the constant
+    # (mean) will be removed. This is detected through checking the scale
+    # difference of the original mean and filtered mean signal. When the
+    # mean is too small, we have to know the original mean signal to
+    # calculate the psc to avoid weird scaling.
     filtered_mean_check = (
-        np.abs(signals.mean(0)).mean() / np.abs(original_mean_signals).mean()
+        np.abs(mean_signals).mean() / np.abs(original_mean_signals).mean()
         < 1e-1
     )
-    if standardize == "psc" and filtered_mean_check:
-        # If the signal is detrended, the mean signal will be zero or close to
-        # zero. If signal is high pass filtered with butterworth, the constant
-        # (mean) will be removed. This is detected through checking the scale
-        # difference of the original mean and filtered mean signal. When the
-        # mean is too small, we have to know the original mean signal to
-        # calculate the psc to avoid weird scaling.
-        signals = standardize_signal(
-            signals + original_mean_signals,
-            standardize=standardize,
-            detrend=False,
+    add_mean = standardize == "psc" and filtered_mean_check
+
+    invalid = parallel(
+        delayed(_standardize_block)(
+            out,
+            block,
+            standardize,
+            original_mean_signals[block] if add_mean else None,
         )
-    else:
-        signals = standardize_signal(
-            signals,
-            standardize=standardize,
-            detrend=False,
+        for block in blocks
+    )
+    if any(invalid):
+        warnings.warn(
+            "psc standardization strategy is meaningless "
+            "for features that have a mean of 0. "
+            "These time series are set to 0.",
+            stacklevel=find_stack_level(),
         )
-    return signals
+    return out
+
+
+def _clean_block(
+    signals,
+    out,
+    block,
+    detrend_basis,
+    sos,
+    filtfilt_kwargs,
+    sample_mask,
+    projection_basis,
+):
+    """Clean a block of columns of signals in place, writing it to out.
+
+    Returns the mean of the block before and after cleaning.
+    """
+    block_signals = signals[:, block]
+    original_mean = block_signals.mean(axis=0)
+    if detrend_basis is not None:
+        block_signals -= detrend_basis @ (detrend_basis.T @ block_signals)
+    if sos is not None:
+        block_signals[...] = sp_signal.sosfiltfilt(
+            sos, block_signals, axis=0, **filtfilt_kwargs
+        )
+        if sample_mask is not None:
+            out[:, block] = block_signals[sample_mask]
+            block_signals = out[:, block]
+    if projection_basis is not None:
+        block_signals -= projection_basis @ (
+            projection_basis.T @ block_signals
+        )
+    return original_mean, block_signals.mean(axis=0)
+
+
+def _standardize_block(signals, block, standardize, original_mean=None):
+    """Standardize a block of columns of signals in place.
+
+    Returns True if some columns have a mean of 0 with psc.
+    """
+    block_signals = signals[:, block]
+    if original_mean is not None:
+        block_signals += original_mean
+    mean_signals = block_signals.mean(axis=0)
+    block_signals -= mean_signals
+
+    if standardize == "zscore_sample":
+        std = block_signals.std(axis=0, ddof=1)
+        # avoid numerical problems
+        std[std < np.finfo(np.float64).eps] = 1.0
+        block_signals /= std
+        return False
+
+    # psc
+    scale = np.absolute(mean_signals)
+    invalid_ix = scale < np.finfo(np.float64).eps
+    scale[invalid_ix] = 1.0
+    block_signals /= scale
+    block_signals *= 100
+    block_signals[:, invalid_ix] = 0
+    return bool(invalid_ix.any())
 
 
 def _handle_scrubbed_volumes(
@@ -1029,6 +1219,7 @@ def _process_runs(
     low_pass,
     high_pass,
     t_r,
+    n_jobs=1,
 ):
     """Process each run independently."""
     if len(runs) != len(signals):
@@ -1054,6 +1245,7 @@ def _process_runs(
             low_pass=low_pass,
             high_pass=high_pass,
             t_r=t_r,
+            n_jobs=n_jobs,
         )
         cleaned_signals.append(run_signals)
     return np.vstack(cleaned_signals)
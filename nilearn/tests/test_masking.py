@@ -19,6 +19,7 @@ from nilearn.masking import (
     _unmask_3d,
     _unmask_4d,
     apply_mask,
+    apply_mask_fmri,
     compute_background_mask,
     compute_brain_mask,
     compute_epi_mask,
@@ -418,6 +419,72 @@ def test_apply_mask_nan(affine_eye):
     assert np.all(np.isfinite(series))
 
 
+@pytest.mark.parametrize("create_files", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 3, 10])
+@pytest.mark.parametrize("smoothing_fwhm", [None, 3])
+def test_apply_mask_chunk_size(
+    tmp_path, rng, affine_eye, create_files, chunk_size, smoothing_fwhm
+):
+    """Check that reading images by chunks does not change the output."""
+    data = rng.standard_normal((9, 10, 11, 7)).astype("float32")
+    data[2, 3, 4, 0] = np.nan
+    data_img = Nifti1Image(data, affine_eye)
+
+    mask = np.zeros((9, 10, 11))
+    mask[2:7, 2:8, 3:9] = 1
+    mask_img = Nifti1Image(mask, affine_eye)
+
+    filenames = write_imgs_to_path(
+        data_img,
+        mask_img,
+        file_path=tmp_path,
+        create_files=create_files,
+    )
+
+    expected = apply_mask(
+        filenames[0], filenames[1], smoothing_fwhm=smoothing_fwhm
+    )
+    series = apply_mask(
+        filenames[0],
+        filenames[1],
+        smoothing_fwhm=smoothing_fwhm,
+        chunk_size=chunk_size,
+    )
+
+    assert series.dtype == expected.dtype
+    assert_array_equal(series, expected)
+
+
+def test_apply_mask_fmri_chunk_size_output(tmp_path, rng, affine_eye):
+    """Check that masked signals can be written in a preallocated memmap."""
+    data = rng.standard_normal((9, 10, 11, 7))
+    data_img = Nifti1Image(data, affine_eye)
+    mask = np.zeros((9, 10, 11), dtype="int8")
+    mask[2:7, 2:8, 3:9] = 1
+    mask_img = Nifti1Image(mask, affine_eye)
+
+    output = np.lib.format.open_memmap(
+        tmp_path / "output.npy",
+        mode="w+",
+        dtype="float64",
+        shape=(7, int(mask.sum())),
+    )
+    series = apply_mask_fmri(data_img, mask_img, chunk_size=2, output=output)
+
+    assert series is output
+    assert_array_equal(series, apply_mask_fmri(data_img, mask_img))
+    # input data must not be modified in place
+    assert_array_equal(get_data(data_img), data)
+
+    with pytest.raises(ValueError, match="'output' must have shape"):
+        apply_mask_fmri(
+            data_img, mask_img, chunk_size=2, output=np.empty((7, 2))
+        )
+
+    with pytest.raises(ValueError, match="'chunk_size' must be"):
+        apply_mask_fmri(data_img, mask_img, chunk_size=0)
+
+
 def test_apply_mask_3d_accepted(affine_eye):
     """Check that 3D data is accepted."""
     data_3d = Nifti1Image(
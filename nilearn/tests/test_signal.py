@@ -1412,6 +1412,51 @@ def test_clean_zscore(rng):
     assert_almost_equal(cleaned_signals.std(0), 1, decimal=3)
 
 
+@pytest.mark.parametrize("filter", ["butterworth", "cosine", False])
+@pytest.mark.parametrize("standardize", ["zscore_sample", "psc", None])
+def test_clean_in_blocks(monkeypatch, filter, standardize):
+    """Check that cleaning in blocks of features matches step-by-step \
+    cleaning, whatever the number of blocks and threads.
+    """
+    signals, _, confounds = generate_signals(
+        n_features=50, n_confounds=3, length=60
+    )
+    signals += 10
+    kwargs = {
+        "detrend": True,
+        "standardize": standardize,
+        "confounds": confounds,
+        "filter": filter,
+        "high_pass": 0.01 if filter else None,
+        "low_pass": 0.1 if filter == "butterworth" else None,
+        "t_r": 2.0,
+    }
+
+    expected = clean(signals, **kwargs)
+
+    # reference obtained by applying each step to the whole matrix
+    if filter != "butterworth":
+        detrended = _detrend(signals)
+        basis = confounds
+        if filter == "cosine":
+            drift = create_cosine_drift(0.01, np.arange(60) * 2.0)[:, :-1]
+            basis = np.hstack([confounds, drift])
+        basis = _detrend(basis)
+        q, _ = np.linalg.qr(basis)
+        reference = detrended - q @ (q.T @ detrended)
+        if standardize is not None:
+            reference = standardize_signal(
+                reference + signals.mean(0) * (standardize == "psc"),
+                standardize=standardize,
+            )
+        assert_almost_equal(expected, reference)
+
+    monkeypatch.setattr(
+        "nilearn.signal._CLEAN_BLOCK_BYTES", 7 * signals.shape[0] * 8
+    )
+    assert_almost_equal(clean(signals, n_jobs=2, **kwargs), expected)
+
+
 def test_clean_sample_mask():
     """Test sample_mask related feature."""
     signals, _, confounds = generate_signals(
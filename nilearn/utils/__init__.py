@@ -1,5 +1,13 @@
 """Utilities for nilearn users."""
 
+from nilearn._utils.cache_statistics import CacheStatistics
+from nilearn._utils.tiered_memory import TieredMemory
 from nilearn.utils.discovery import all_displays, all_estimators, all_functions
 
-__all__ = ["all_displays", "all_estimators", "all_functions"]
+__all__ = [
+    "CacheStatistics",
+    "TieredMemory",
+    "all_displays",
+    "all_estimators",
+    "all_functions",
+]